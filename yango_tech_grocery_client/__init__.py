@@ -13,7 +13,7 @@ from .client import YangoClient
 from .client_prices import YangoPricesClient
 from .client_third_party_logistics import YangoThirdPartyLogisticsClient
 from .constants import LOYALTY_PAYMENT_METHODS, REAL_MONEY_PAYMENT_METHODS
-from .exceptions import YangoException, YangoRequestError
+from .exceptions import YangoCircuitOpenError, YangoException, YangoRequestError
 
 # Import main schema classes for convenience
 from .schema import (
@@ -80,6 +80,7 @@ from .schema import (
     YangoThirdPartyLogisticsDeliveryType,
     YangoTypeAccounting,
 )
+from .utils import install_uvloop
 
 __all__ = [
     # Main client classes
@@ -93,6 +94,9 @@ __all__ = [
     # Exceptions
     'YangoException',
     'YangoRequestError',
+    'YangoCircuitOpenError',
+    # Utilities
+    'install_uvloop',
     # Schema classes
     'AttributeTranslations',
     'Point',
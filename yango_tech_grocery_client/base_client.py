@@ -1,17 +1,58 @@
-from collections.abc import Generator
+import asyncio
+import io
+from collections.abc import AsyncGenerator, Awaitable, Callable, Generator, Hashable, Iterable
+from contextlib import AbstractContextManager, ExitStack, nullcontext
 from enum import Enum
+from types import TracebackType
 from typing import Any, TypeVar
 
 import aiohttp
+import orjson
 from aiohttp import ClientSession
 from yarl import URL
 
-from .constants import DEFAULT_BATCH_SIZE
+from .batcher import AsyncBatcher
+from .circuit_breaker import yango_circuit_breaker
+from .constants import (
+    CONNECTION_POOL_LIMIT,
+    CONNECTION_POOL_LIMIT_PER_HOST,
+    DEFAULT_BATCH_SIZE,
+    DNS_CACHE_TTL,
+    KEEPALIVE_TIMEOUT,
+    MAX_CONCURRENT_REQUESTS,
+)
 from .exceptions import YangoRequestError
 from .rate_limiter import yango_rate_limiter
 from .utils import YangoErrorHandler, retry_request
 
 T = TypeVar('T')
+R = TypeVar('R')
+ClientT = TypeVar('ClientT', bound='BaseYangoClient')
+
+# Coercion of multipart field values, resolved once per value type
+_form_value_coercions: dict[type, Callable[[Any], Any]] = {}
+
+
+def _keep_form_value(value: Any) -> Any:
+    return value
+
+
+def _enum_form_value(value: Enum) -> Any:
+    return value.value
+
+
+def _coerce_form_value(value: Any) -> Any:
+    value_type = type(value)
+    coerce = _form_value_coercions.get(value_type)
+    if coerce is None:
+        if issubclass(value_type, int):
+            coerce = str
+        elif issubclass(value_type, Enum):
+            coerce = _enum_form_value
+        else:
+            coerce = _keep_form_value
+        _form_value_coercions[value_type] = coerce
+    return coerce(value)
 
 
 class BaseYangoClient:
@@ -23,6 +64,7 @@ class BaseYangoClient:
         proxy: str | URL | None = None,
         ssl: bool | None = None,
         should_use_rate_limiter: bool = False,
+        should_use_circuit_breaker: bool = False,
     ):
         self.auth_token = auth_token
         self.domain = domain
@@ -30,17 +72,114 @@ class BaseYangoClient:
         self.proxy = proxy
         self.ssl = ssl if ssl is not None else not bool(proxy)
         self.should_use_rate_limiter = should_use_rate_limiter
+        self.should_use_circuit_breaker = should_use_circuit_breaker
+        self._session: ClientSession | None = None
+        self._batchers: dict[Hashable, AsyncBatcher[Any]] = {}
+
+    @property
+    def auth_token(self) -> str:
+        return self._auth_token
+
+    @auth_token.setter
+    def auth_token(self, auth_token: str) -> None:
+        # Headers are built once per token instead of on every request
+        self._auth_token = auth_token
+        self._multipart_headers = {'Authorization': f'Bearer {auth_token}'}
+        self._json_headers = {**self._multipart_headers, 'Content-Type': 'application/json'}
+
+    @property
+    def domain(self) -> str:
+        return self._domain
+
+    @domain.setter
+    def domain(self, domain: str) -> None:
+        self._domain = domain
+        self._urls: dict[str, URL] = {}
+
+    def _get_url(self, endpoint: str) -> URL:
+        """
+        Return the parsed URL of the endpoint, cached so yarl parses each endpoint URL only once
+        """
+        url = self._urls.get(endpoint)
+        if url is None:
+            url = self._urls[endpoint] = URL(self.domain + endpoint)
+        return url
+
+    async def __aenter__(self: ClientT) -> ClientT:
+        await self._get_session()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        await self.close()
+
+    async def _get_session(self) -> ClientSession:
+        """
+        Return the shared session, creating it on first use.
+        Keeping one session per client lets aiohttp reuse pooled keep-alive connections
+        instead of doing a new TCP + TLS handshake for every request
+        """
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=CONNECTION_POOL_LIMIT,
+                limit_per_host=CONNECTION_POOL_LIMIT_PER_HOST,
+                ttl_dns_cache=DNS_CACHE_TTL,
+                keepalive_timeout=KEEPALIVE_TIMEOUT,
+            )
+            self._session = ClientSession(connector=connector)
+        return self._session
+
+    async def close(self) -> None:
+        """
+        Close the underlying HTTP session.
+        Call it when the client is no longer needed, unless the client is used as an async context manager.
+        Items buffered by batchers are sent before the session is closed
+        """
+        batchers = list(self._batchers.values())
+        self._batchers.clear()
+        for batcher in batchers:
+            await batcher.close()
+
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
 
-    async def process_yango_response(self, resp: aiohttp.ClientResponse, payload: dict[Any, Any] | None = None) -> Any:
+    async def process_yango_response(
+        self,
+        resp: aiohttp.ClientResponse,
+        payload: dict[Any, Any] | None = None,
+        request_body: bytes | None = None,
+    ) -> Any:
+        """
+        Decode a successful response or raise YangoRequestError, also for a successful status with a non-JSON body.
+        `request_body` is the encoded JSON body of the request. It is decoded back into `payload`
+        only when the request failed, so the hot path never pays for it
+        """
         trace_id = resp.headers.get('x-yatraceid')
         request_id = resp.headers.get('x-yarequestid')
         status = resp.status
 
+        decode_error: orjson.JSONDecodeError | None = None
         if 200 <= status < 300:
-            return await resp.json()
+            body = await resp.read()
+            if not body.strip():
+                return None
+            try:
+                return orjson.loads(body)
+            except orjson.JSONDecodeError as e:
+                # A successful status with a body that isn't JSON, e.g. an HTML page from a proxy
+                decode_error = e
+                response_text = body.decode(errors='replace')
+        else:
+            response_text = await resp.text()
 
         url = str(resp.url)
-        response_text = await resp.text()
+        if payload is None and request_body is not None:
+            payload = orjson.loads(request_body)
 
         message = (
             f'Status {status} from Yango on {url}. Trace ID {trace_id}.'
@@ -51,37 +190,132 @@ class BaseYangoClient:
                 url, status, trace_id, request_id, response_text, payload=payload
             )
 
-        raise YangoRequestError(message, url, status, response_text, payload=payload)
+        raise YangoRequestError(message, url, status, response_text, payload=payload) from decode_error
 
-    @retry_request
-    async def yango_request(self, endpoint: str, data: dict[str, Any]) -> Any:
-        if self.should_use_rate_limiter:
-            await yango_rate_limiter.acquire(endpoint, auth_token=self.auth_token)
+    async def yango_request(self, endpoint: str, data: Any) -> Any:
+        """
+        Send a JSON request. `data` may contain dataclass instances and enums:
+        orjson serializes them natively, so callers don't need to convert them with `asdict`
+        """
+        # Encoded once, retries resend the same bytes
+        body = orjson.dumps(data)
+        with self._circuit_breaker_guard(endpoint):
+            return await self._json_request(endpoint, body)
+
+    async def yango_multipart_request(self, endpoint: str, data: dict[str, Any]) -> Any:
+        with self._circuit_breaker_guard(endpoint):
+            return await self._multipart_request(endpoint, data)
 
-        headers = {'Authorization': f'Bearer {self.auth_token}', 'Content-Type': 'application/json'}
-        url = self.domain + endpoint
-        async with ClientSession() as session:
-            async with session.post(url=url, json=data, headers=headers, proxy=self.proxy, ssl=self.ssl) as resp:
-                return await self.process_yango_response(resp, payload=data)
+    def _circuit_breaker_guard(self, endpoint: str) -> AbstractContextManager[None]:
+        """
+        Guard one logical request, retries included, so the circuit counts a request failing all its attempts once
+        """
+        if not self.should_use_circuit_breaker:
+            return nullcontext()
+        return yango_circuit_breaker.guard(endpoint, auth_token=self.auth_token)
 
     @retry_request
-    async def yango_multipart_request(self, endpoint: str, data: dict[str, Any]) -> Any:
-        if self.should_use_rate_limiter:
+    async def _json_request(self, endpoint: str, body: bytes) -> Any:
+        return await self._post(endpoint, self._json_headers, body, request_body=body)
+
+    @retry_request
+    async def _multipart_request(self, endpoint: str, data: dict[str, Any]) -> Any:
+        # Views of BytesIO buffers are released when the attempt ends, even if it fails:
+        # while a view is alive the caller can't write to, truncate or resize its buffer
+        with ExitStack() as buffer_views:
+            form_data = aiohttp.FormData()
+            for key, value in data.items():
+                if isinstance(value, io.BytesIO):
+                    # A view of the buffer from the current position, as aiohttp would stream it: sent without
+                    # copying or executor hops, and unlike the stream itself it is not left consumed for a retry
+                    buffer = buffer_views.enter_context(value.getbuffer())
+                    value = buffer_views.enter_context(buffer[value.tell() :])
+                if isinstance(value, (bytes, bytearray, memoryview)):
+                    form_data.add_field(name=key, value=value, filename=key)
+                else:
+                    form_data.add_field(name=key, value=_coerce_form_value(value))
+
+            return await self._post(endpoint, self._multipart_headers, form_data)
+
+    async def _post(self, endpoint: str, headers: dict[str, str], data: Any, request_body: bytes | None = None) -> Any:
+        if self.should_use_rate_limiter and not yango_rate_limiter.try_acquire_nowait(
+            endpoint, auth_token=self.auth_token
+        ):
             await yango_rate_limiter.acquire(endpoint, auth_token=self.auth_token)
 
-        headers = {'Authorization': f'Bearer {self.auth_token}'}
-        url = self.domain + endpoint
-        form_data = aiohttp.FormData()
-        for key, value in data.items():
-            if isinstance(value, int):
-                value = str(value)
-            if isinstance(value, Enum):
-                value = value.value
-            form_data.add_field(name=key, value=value)
-
-        async with ClientSession() as session:
-            async with session.post(url=url, data=form_data, headers=headers, proxy=self.proxy, ssl=self.ssl) as resp:
-                return await self.process_yango_response(resp)
+        url = self._get_url(endpoint)
+        session = await self._get_session()
+        async with session.post(url=url, data=data, headers=headers, proxy=self.proxy, ssl=self.ssl) as resp:
+            return await self.process_yango_response(resp, request_body=request_body)
+
+    async def paginate(
+        self, endpoint: str, items_key: str, limit: int, cursor: str | None = None
+    ) -> AsyncGenerator[list[dict[str, Any]], None]:
+        """
+        Yield pages of `items_key` records from a cursor-paginated endpoint, starting from the cursor.
+        The next page is requested before the current one is yielded,
+        so the network round-trip overlaps with the caller processing the current page
+        """
+        next_page = asyncio.ensure_future(self.yango_request(endpoint, {'cursor': cursor, 'limit': limit}))
+        try:
+            while True:
+                response = await next_page
+                items = response[items_key]
+                if len(items) < limit:
+                    yield items
+                    return
+
+                next_page = asyncio.ensure_future(
+                    self.yango_request(endpoint, {'cursor': response['cursor'], 'limit': limit})
+                )
+                yield items
+        finally:
+            # The caller may stop iterating while the next page is still in flight
+            if not next_page.done():
+                next_page.cancel()
+            elif not next_page.cancelled():
+                next_page.exception()
+
+    @staticmethod
+    async def run_concurrently(
+        func: Callable[[T], Awaitable[R]], args: Iterable[T], concurrency: int = MAX_CONCURRENT_REQUESTS
+    ) -> list[R]:
+        """
+        Call `func` for every item of `args`, keeping at most `concurrency` calls in flight.
+        Results are returned in the order of `args`. If any call fails, the remaining ones are cancelled
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run(arg: T) -> R:
+            async with semaphore:
+                return await func(arg)
+
+        tasks = [asyncio.ensure_future(run(arg)) for arg in args]
+        try:
+            return await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+    def get_batcher(
+        self, key: Hashable, flush: Callable[[list[T]], Awaitable[None]], max_batch_size: int
+    ) -> AsyncBatcher[T]:
+        """
+        Return the batcher registered under the key, creating it with the flush function on first use.
+        `max_batch_size` should match the batch size of the bulk request behind `flush`, so a full batch is one request.
+        A batcher is dropped once it is idle, so long-lived clients don't keep one for every key they ever used
+        """
+        batcher = self._batchers.get(key)
+        if batcher is None:
+
+            def drop_batcher() -> None:
+                if self._batchers.get(key) is batcher:
+                    del self._batchers[key]
+
+            batcher = self._batchers[key] = AsyncBatcher(flush, max_batch_size, on_idle=drop_batcher)
+        return batcher
 
     @staticmethod
     def batch_items(items: list[T], batch_size: int = DEFAULT_BATCH_SIZE) -> Generator[list[T], None, None]:
@@ -0,0 +1,101 @@
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import Generic, TypeVar
+
+from .constants import BATCHER_MAX_WAIT, DEFAULT_BATCH_SIZE
+
+T = TypeVar('T')
+
+
+class AsyncBatcher(Generic[T]):
+    """
+    Coalesces concurrent single-item calls into bulk calls.
+    Items are buffered until `max_batch_size` items are collected or `max_wait` seconds pass
+    since the first buffered item, then `flush` is called once for the whole batch.
+    Every caller waits for the batch its item belongs to, errors are propagated to all of them
+    """
+
+    def __init__(
+        self,
+        flush: Callable[[list[T]], Awaitable[None]],
+        max_batch_size: int = DEFAULT_BATCH_SIZE,
+        max_wait: float = BATCHER_MAX_WAIT,
+        on_idle: Callable[[], None] | None = None,
+    ):
+        """
+        Initialize the batcher
+
+        Args:
+            flush: Coroutine function sending a batch of items
+            max_batch_size: Maximum number of items sent in one batch
+            max_wait: Maximum time in seconds an item waits for the batch to fill up
+            on_idle: Called when the last batch in flight is sent and no items are buffered
+        """
+        self.flush = flush
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.on_idle = on_idle
+        self._items: list[T] = []
+        self._waiters: list[asyncio.Future[None]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    async def submit(self, item: T) -> None:
+        """
+        Add the item to the current batch and wait until the batch is sent
+        """
+        loop = asyncio.get_running_loop()
+        waiter = loop.create_future()
+        self._items.append(item)
+        self._waiters.append(waiter)
+
+        if len(self._items) >= self.max_batch_size:
+            self._send()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._send)
+
+        await waiter
+
+    async def close(self) -> None:
+        """
+        Send the buffered items and wait for all batches in flight
+        """
+        self._send()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def _send(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        if not self._items:
+            return
+
+        items, waiters = self._items, self._waiters
+        self._items, self._waiters = [], []
+
+        task = asyncio.ensure_future(self._flush(items, waiters))
+        self._tasks.add(task)
+        task.add_done_callback(self._flush_done)
+
+    def _flush_done(self, task: asyncio.Task[None]) -> None:
+        self._tasks.discard(task)
+        if not self._tasks and not self._items and self.on_idle is not None:
+            self.on_idle()
+
+    async def _flush(self, items: list[T], waiters: list[asyncio.Future[None]]) -> None:
+        try:
+            await self.flush(items)
+        except asyncio.CancelledError:
+            for waiter in waiters:
+                waiter.cancel()
+            raise
+        except Exception as e:
+            for waiter in waiters:
+                if not waiter.done():
+                    waiter.set_exception(e)
+        else:
+            for waiter in waiters:
+                if not waiter.done():
+                    waiter.set_result(None)
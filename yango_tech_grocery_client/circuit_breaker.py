@@ -0,0 +1,116 @@
+import asyncio
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+import aiohttp
+
+from .constants import CIRCUIT_BREAKER_FAILURE_THRESHOLD, CIRCUIT_BREAKER_RECOVERY_TIMEOUT, ERROR_STATUSES_FOR_RETRY
+from .exceptions import YangoCircuitOpenError, YangoRequestError
+
+
+class CircuitBreaker:
+    """
+    A circuit breaker that tracks consecutive failures per auth_token and endpoint combination.
+    Once an (auth_token, endpoint) pair fails `failure_threshold` times in a row, the circuit opens
+    and requests fail immediately for `recovery_timeout` seconds instead of piling more load on the API
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+        recovery_timeout: float = CIRCUIT_BREAKER_RECOVERY_TIMEOUT,
+    ):
+        """
+        Initialize the circuit breaker
+
+        Args:
+            failure_threshold: Number of consecutive failures that opens the circuit
+            recovery_timeout: Seconds to wait before letting requests through again
+        """
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.failures: dict[tuple[str, str], int] = {}
+        self.opened_at: dict[tuple[str, str], float] = {}
+        # Keys with a request in flight after the recovery timeout: only that probe is let through
+        self.probing: set[tuple[str, str]] = set()
+
+    def check(self, endpoint: str, auth_token: str) -> None:
+        """
+        Raise YangoCircuitOpenError if the circuit is open for the specified endpoint and auth_token.
+
+        When the recovery timeout has passed, a single probe request is let through (half-open state),
+        the others keep failing until it finishes. A failure of the probe reopens the circuit, a success closes it.
+        The caller must report the outcome of a request let through with record_success, record_failure or release
+
+        Args:
+            endpoint: The endpoint URL being requested
+            auth_token: The authentication auth_token being used
+        """
+        key = (auth_token, endpoint)
+        opened_at = self.opened_at.get(key)
+        if opened_at is None:
+            return
+
+        retry_after = opened_at + self.recovery_timeout - time.monotonic()
+        if retry_after > 0:
+            raise YangoCircuitOpenError(endpoint, retry_after)
+
+        if key in self.probing:
+            raise YangoCircuitOpenError(endpoint, 0)
+        self.probing.add(key)
+
+    @contextmanager
+    def guard(self, endpoint: str, auth_token: str) -> Iterator[None]:
+        """
+        Check the circuit, then record the outcome of the request made inside the block.
+        Server errors from ERROR_STATUSES_FOR_RETRY, connection errors and timeouts count as failures.
+        Other errors (e.g. a bad request) are answers from a working API, they neither count nor reset failures
+        """
+        self.check(endpoint, auth_token)
+        try:
+            yield
+        except YangoRequestError as e:
+            if e.status in ERROR_STATUSES_FOR_RETRY:
+                self.record_failure(endpoint, auth_token)
+            else:
+                self.release(endpoint, auth_token)
+            raise
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            self.record_failure(endpoint, auth_token)
+            raise
+        except BaseException:
+            self.release(endpoint, auth_token)
+            raise
+        else:
+            self.record_success(endpoint, auth_token)
+
+    def record_success(self, endpoint: str, auth_token: str) -> None:
+        """
+        Close the circuit and reset the failure counter
+        """
+        key = (auth_token, endpoint)
+        self.failures.pop(key, None)
+        self.opened_at.pop(key, None)
+        self.probing.discard(key)
+
+    def record_failure(self, endpoint: str, auth_token: str) -> None:
+        """
+        Count a failure and open the circuit once the threshold is reached
+        """
+        key = (auth_token, endpoint)
+        failures = self.failures.get(key, 0) + 1
+        self.failures[key] = failures
+        self.probing.discard(key)
+
+        if failures >= self.failure_threshold:
+            self.opened_at[key] = time.monotonic()
+
+    def release(self, endpoint: str, auth_token: str) -> None:
+        """
+        Finish a request without an outcome for the circuit, letting the next probe through if it was one
+        """
+        self.probing.discard((auth_token, endpoint))
+
+
+yango_circuit_breaker = CircuitBreaker()
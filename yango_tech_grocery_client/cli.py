@@ -6,28 +6,41 @@ Command-line interface for Yango Grocery Client.
 import argparse
 import asyncio
 import sys
-from typing import TYPE_CHECKING
+from collections import Counter
+from collections.abc import Callable, Coroutine
+from operator import attrgetter
+from typing import TYPE_CHECKING, Any
 
 from .client import YangoClient
 from .constants import DEFAULT_DOMAIN
+from .utils import install_uvloop
 
 if TYPE_CHECKING:
     from .schema import YangoThirdPartyLogisticsDeliveryType
 
 
+def write_lines(lines: list[str]) -> None:
+    """Write all lines to stdout at once instead of one print call per line."""
+    lines.append('')
+    sys.stdout.write('\n'.join(lines))
+
+
 async def get_stores(domain: str, auth_token: str) -> None:
     """Get and display all stores."""
     client = YangoClient(domain=domain, auth_token=auth_token)
     try:
         stores = await client.get_stores()
-        print(f'Found {len(stores)} stores:')
+        lines = [f'Found {len(stores)} stores:']
         for store in stores:
-            print(f'  - {store.id}: {store.name}')
-            print(f'    Address: {store.address}')
-            print(f'    Coordinates: {store.location.lat}, {store.location.lon}')
+            lines.append(f'  - {store.id}: {store.name}')
+            lines.append(f'    Address: {store.address}')
+            lines.append(f'    Coordinates: {store.location.lat}, {store.location.lon}')
+        write_lines(lines)
     except Exception as e:
         print(f'Error getting stores: {e}', file=sys.stderr)
         sys.exit(1)
+    finally:
+        await client.close()
 
 
 async def get_products(domain: str, auth_token: str, only_active: bool = True) -> None:
@@ -35,14 +48,17 @@ async def get_products(domain: str, auth_token: str, only_active: bool = True) -
     client = YangoClient(domain=domain, auth_token=auth_token)
     try:
         products = await client.get_all_products(only_active=only_active)
-        print(f'Found {len(products)} {"active " if only_active else ""}products:')
+        lines = [f'Found {len(products)} {"active " if only_active else ""}products:']
         for product_id, product in products.items():
-            print(f'  - {product_id}:')
-            print(f'    Master category: {product.master_category}')
-            print(f'    Status: {product.status}')
+            lines.append(f'  - {product_id}:')
+            lines.append(f'    Master category: {product.master_category}')
+            lines.append(f'    Status: {product.status}')
+        write_lines(lines)
     except Exception as e:
         print(f'Error getting products: {e}', file=sys.stderr)
         sys.exit(1)
+    finally:
+        await client.close()
 
 
 async def get_stocks(domain: str, auth_token: str) -> None:
@@ -53,20 +69,23 @@ async def get_stocks(domain: str, auth_token: str) -> None:
     try:
         stocks = await client.get_all_stocks()
         total_products = sum(len(store_stock) for store_stock in stocks.values())
-        print(f'Found {len(stocks)} stores with {total_products} products in stock:')
+        lines = [f'Found {len(stocks)} stores with {total_products} products in stock:']
         for store_id, store_stock in stocks.items():
-            print(f'  - {store_id} ({len(store_stock)} products):')
+            lines.append(f'  - {store_id} ({len(store_stock)} products):')
             for product_id, stock in store_stock.items():
-                print(f'    - Product Id: {product_id}')
-                print(f'      Quantity: {stock.quantity}')
+                lines.append(f'    - Product Id: {product_id}')
+                lines.append(f'      Quantity: {stock.quantity}')
                 if isinstance(stock.shelf_type, YangoStockShelfType):
                     shelf_type_str = stock.shelf_type.value
                 else:
                     shelf_type_str = str(stock.shelf_type)
-                print(f'      Shelf type: {shelf_type_str}')
+                lines.append(f'      Shelf type: {shelf_type_str}')
+        write_lines(lines)
     except Exception as e:
         print(f'Error getting stocks: {e}', file=sys.stderr)
         sys.exit(1)
+    finally:
+        await client.close()
 
 
 async def get_order_detail(domain: str, auth_token: str, order_id: str) -> None:
@@ -82,6 +101,8 @@ async def get_order_detail(domain: str, auth_token: str, order_id: str) -> None:
     except Exception as e:
         print(f'Error getting order details: {e}', file=sys.stderr)
         sys.exit(1)
+    finally:
+        await client.close()
 
 
 async def get_3pl_events(domain: str, auth_token: str, cursor: str | None = None, limit: int | None = None) -> None:
@@ -90,44 +111,62 @@ async def get_3pl_events(domain: str, auth_token: str, cursor: str | None = None
     try:
         events_response = await client.get_deliveries_events(cursor=cursor, limit=limit)
 
-        event_counts: dict[YangoThirdPartyLogisticsDeliveryType, int] = {}
-        for event in events_response.events:
-            event_type = event.data.type
-            event_counts[event_type] = event_counts.get(event_type, 0) + 1
+        event_counts: Counter[YangoThirdPartyLogisticsDeliveryType] = Counter(
+            map(attrgetter('data.type'), events_response.events)
+        )
 
-        print(f'Found {len(events_response.events)} 3PL delivery events:')
-        print(f'Cursor: {events_response.cursor}')
-        print()
+        lines = [
+            f'Found {len(events_response.events)} 3PL delivery events:',
+            f'Cursor: {events_response.cursor}',
+            '',
+        ]
 
         if event_counts:
-            print('Event types summary:')
+            lines.append('Event types summary:')
             for event_type, count in sorted(event_counts.items()):
-                print(f'  {event_type}: {count}')
+                lines.append(f'  {event_type}: {count}')
         else:
-            print('No events found.')
+            lines.append('No events found.')
+        write_lines(lines)
     except Exception as e:
         print(f'Error getting 3PL events: {e}', file=sys.stderr)
         sys.exit(1)
+    finally:
+        await client.close()
 
 
 async def update_delivery_status(domain: str, auth_token: str, delivery_id: int, status: str) -> None:
     """Update delivery status."""
     from .schema import YangoThirdPartyLogisticsDeliveryStatus
 
+    # Validated before the client is created, so errors of the request itself are never reported as a bad status
+    valid_statuses = [s.value for s in YangoThirdPartyLogisticsDeliveryStatus]
+    if status not in valid_statuses:
+        print(f'Invalid status "{status}". Valid statuses: {valid_statuses}', file=sys.stderr)
+        sys.exit(1)
+
     client = YangoClient(domain=domain, auth_token=auth_token)
     try:
         delivery_status = YangoThirdPartyLogisticsDeliveryStatus(status)
         await client.update_delivery_status(delivery_id, delivery_status)
         print(f'Successfully updated delivery {delivery_id} status to {status}')
-    except ValueError:
-        print(
-            f'Invalid status "{status}". Valid statuses: {[s.value for s in YangoThirdPartyLogisticsDeliveryStatus]}',
-            file=sys.stderr,
-        )
-        sys.exit(1)
     except Exception as e:
         print(f'Error updating delivery status: {e}', file=sys.stderr)
         sys.exit(1)
+    finally:
+        await client.close()
+
+
+COMMANDS: dict[str, Callable[[argparse.Namespace], Coroutine[Any, Any, None]]] = {
+    'stores': lambda args: get_stores(args.domain, args.token),
+    'products': lambda args: get_products(args.domain, args.token, not args.all),
+    'stocks': lambda args: get_stocks(args.domain, args.token),
+    'order': lambda args: get_order_detail(args.domain, args.token, args.order_id),
+    '3pl-events': lambda args: get_3pl_events(args.domain, args.token, args.cursor, args.limit),
+    '3pl-update-delivery-status': lambda args: update_delivery_status(
+        args.domain, args.token, args.delivery_id, args.status
+    ),
+}
 
 
 def main() -> None:
@@ -181,19 +220,9 @@ Examples:
         parser.print_help()
         sys.exit(1)
 
-    # Run the appropriate command
-    if args.command == 'stores':
-        asyncio.run(get_stores(args.domain, args.token))
-    elif args.command == 'products':
-        asyncio.run(get_products(args.domain, args.token, not args.all))
-    elif args.command == 'stocks':
-        asyncio.run(get_stocks(args.domain, args.token))
-    elif args.command == 'order':
-        asyncio.run(get_order_detail(args.domain, args.token, args.order_id))
-    elif args.command == '3pl-events':
-        asyncio.run(get_3pl_events(args.domain, args.token, args.cursor, args.limit))
-    elif args.command == '3pl-update-delivery-status':
-        asyncio.run(update_delivery_status(args.domain, args.token, args.delivery_id, args.status))
+    # Run the appropriate command, on uvloop if it is installed
+    install_uvloop()
+    asyncio.run(COMMANDS[args.command](args))
 
 
 if __name__ == '__main__':
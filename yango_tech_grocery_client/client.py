@@ -1,10 +1,11 @@
 import logging
-from collections.abc import AsyncGenerator
-from dataclasses import asdict, fields
-from enum import Enum
+import os
+from collections.abc import AsyncGenerator, Callable
+from dataclasses import fields
+from operator import itemgetter
 from typing import Any
 
-from dacite import Config, from_dict
+from dacite import from_dict
 
 from .client_prices import YangoPricesClient
 from .client_third_party_logistics import YangoThirdPartyLogisticsClient
@@ -14,6 +15,7 @@ from .constants import (
     SERVICE_NAME,
     STOCKS_BATCH_SIZE,
     STOCKS_REQUEST_LIMIT,
+    USE_UVLOOP_ENV_VARIABLE,
     VAT_BATCH_SIZE,
 )
 from .endpoints import (
@@ -61,13 +63,39 @@ from .schema import (
     YangoStockUpdateMode,
     YangoStoreRecord,
 )
+from .utils import DACITE_CONFIG, DACITE_ENUM_CONFIG, install_uvloop
 
 logger = logging.getLogger(SERVICE_NAME)
 
+# Opt-in only: replacing the event loop policy of the host application on import would be surprising
+if os.environ.get(USE_UVLOOP_ENV_VARIABLE, '').lower() in ('1', 'true'):
+    install_uvloop()
+
+# Computed once: filter_extra_attributes runs for every product loaded from WMS
+_CUSTOM_ATTRIBUTES_FIELDS = frozenset(field.name for field in fields(YangoCustomAttributes))
+
+_OrderEventData = YangoStateChangeEventData | YangoNewOrderEventData | YangoReceiptIssuedEventData
+
+_get_order_event_fields = itemgetter('order_id', 'occurred', 'data')
+
+# Unknown states are kept as raw strings, as YangoStateChangeEventData allows, instead of failing the whole page
+_ORDER_STATES: dict[str, YangoOrderState | str] = {state.value: state for state in YangoOrderState}
+
+# Keyed by the raw type strings, as they come in the response
+_ORDER_EVENT_BUILDERS: dict[str, Callable[[dict[str, Any]], _OrderEventData]] = {
+    YangoOrderEventType.STATE_CHANGE.value: lambda event: YangoStateChangeEventData(
+        type=event['type'], current_state=_ORDER_STATES.get(event['current_state'], event['current_state'])
+    ),
+    YangoOrderEventType.NEW_ORDER.value: lambda event: YangoNewOrderEventData(type=event['type']),
+    YangoOrderEventType.RECEIPT_ISSUED.value: lambda event: YangoReceiptIssuedEventData(
+        type=event['type'], receipt_id=event['receipt_id']
+    ),
+}
+
 
 class YangoClient(YangoThirdPartyLogisticsClient, YangoPricesClient):
     async def create_order(self, data: YangoOrderRecord) -> Any:
-        return await self.yango_request(ORDER_CREATE_ENDPOINT, asdict(data))
+        return await self.yango_request(ORDER_CREATE_ENDPOINT, data)
 
     async def cancel_order(self, order_id: str, reason: str | None = None) -> Any:
         data = {'order_id': order_id}
@@ -78,30 +106,30 @@ class YangoClient(YangoThirdPartyLogisticsClient, YangoPricesClient):
         return await self.yango_request(ORDER_CANCEL_ENDPOINT, data)
 
     async def update_order(self, data: YangoOrderRecord) -> Any:
-        return await self.yango_request(ORDER_UPDATE_ENDPOINT, asdict(data))
+        return await self.yango_request(ORDER_UPDATE_ENDPOINT, data)
 
     async def get_order_detail(self, order_id: str) -> YangoOrderDetails:
         data = {'order_id': order_id}
         response = await self.yango_request(ORDER_DETAIL_ENDPOINT, data)
+        # The decoded response is owned here, so fill it in place instead of copying it into a new dict
+        response.setdefault('order_id', order_id)
 
-        return from_dict(YangoOrderDetails, {'order_id': order_id, **response})
+        return from_dict(YangoOrderDetails, response, config=DACITE_CONFIG)
 
     async def get_orders_state(self, order_ids: list[str]) -> list[YangoOrderStateQuery]:
         data = {'orders': order_ids}
         response = await self.yango_request(ORDERS_STATE_ENDPOINT, data)
 
-        return [from_dict(YangoOrderStateQuery, orders_state) for orders_state in response['query_results']]
+        return [
+            from_dict(YangoOrderStateQuery, orders_state, config=DACITE_CONFIG)
+            for orders_state in response['query_results']
+        ]
 
-    def process_order_event_data(
-        self, event: dict[str, Any]
-    ) -> YangoStateChangeEventData | YangoNewOrderEventData | YangoReceiptIssuedEventData:
-        if event['type'] == YangoOrderEventType.STATE_CHANGE:
-            return YangoStateChangeEventData(type=event['type'], current_state=YangoOrderState(event['current_state']))
-        if event['type'] == YangoOrderEventType.NEW_ORDER:
-            return YangoNewOrderEventData(type=event['type'])
-        if event['type'] == YangoOrderEventType.RECEIPT_ISSUED:
-            return YangoReceiptIssuedEventData(type=event['type'], receipt_id=event['receipt_id'])
-        raise ValueError(f'Unknown event type {event["type"]}')
+    def process_order_event_data(self, event: dict[str, Any]) -> _OrderEventData:
+        build_event = _ORDER_EVENT_BUILDERS.get(event['type'])
+        if build_event is None:
+            raise ValueError(f'Unknown event type {event["type"]}')
+        return build_event(event)
 
     async def get_orders_events_query(self, cursor: str | None = None) -> YangoOrderEventQueryResponse:
         data: dict[str, Any] = {}
@@ -110,15 +138,12 @@ class YangoClient(YangoThirdPartyLogisticsClient, YangoPricesClient):
             data['cursor'] = cursor
 
         response = await self.yango_request(ORDERS_EVENTS_QUERY_ENDPOINT, data)
+        process_order_event_data = self.process_order_event_data
         return YangoOrderEventQueryResponse(
             cursor=response['cursor'],
             orders_events=[
-                YangoOrderEvent(
-                    order_id=event['order_id'],
-                    occurred=event['occurred'],
-                    data=self.process_order_event_data(event['data']),
-                )
-                for event in response.get('orders_events', [])
+                YangoOrderEvent(order_id=order_id, occurred=occurred, data=process_order_event_data(data))
+                for order_id, occurred, data in map(_get_order_event_fields, response.get('orders_events', []))
             ],
         )
 
@@ -147,7 +172,7 @@ class YangoClient(YangoThirdPartyLogisticsClient, YangoPricesClient):
 
         response = await self.yango_request(RECEIPTS_GET_ENDPOINT, data)
 
-        return from_dict(YangoGetReceiptResponse, response, config=Config(cast=[Enum]))
+        return from_dict(YangoGetReceiptResponse, response, config=DACITE_ENUM_CONFIG)
 
     async def upload_receipt(self, receipt_id: str, document: str) -> None:
         data = {'receipt_id': receipt_id, 'document': document, 'content_type': 'application/pdf'}
@@ -166,12 +191,16 @@ class YangoClient(YangoThirdPartyLogisticsClient, YangoPricesClient):
         Filter extra attributes from the product data
         Extra attributes are those that are not in the CustomAttributes schema
         """
+        # The key set difference runs in C, without extra attributes the split is a plain dict copy
+        extra_keys = attribute_dict.keys() - _CUSTOM_ATTRIBUTES_FIELDS
+        if not extra_keys:
+            return dict(attribute_dict), {}
+
         extra_attributes: dict[str, Any] = {}
         custom_attributes: dict[str, Any] = {}
 
-        base_fields = {field.name for field in fields(YangoCustomAttributes)}
         for key, value in attribute_dict.items():
-            if key in base_fields:
+            if key in _CUSTOM_ATTRIBUTES_FIELDS:
                 custom_attributes[key] = value
             else:
                 extra_attributes[key] = value
@@ -183,60 +212,83 @@ class YangoClient(YangoThirdPartyLogisticsClient, YangoPricesClient):
         Returns an async generator that yields product update from WMS, starting from the cursor
         If you want full snapshot - use get_all_products
         """
+        async for product in self._get_raw_product_updates(cursor):
+            yield self._decode_product(product)
+
+    async def _get_raw_product_updates(self, cursor: str | None = None) -> AsyncGenerator[dict[str, Any], None]:
         logger.info('Loading existing products from WMS')
         total_product_count = 0
-        while True:
-            data: dict[str, Any] = {'cursor': cursor, 'limit': PRODUCTS_REQUEST_LIMIT}
-            response = await self.yango_request(PRODUCT_UPDATES_ENDPOINT, data)
-            products = response['products']
-            cursor = response['cursor']
+        async for products in self.paginate(PRODUCT_UPDATES_ENDPOINT, 'products', PRODUCTS_REQUEST_LIMIT, cursor):
             total_product_count += len(products)
             logger.info(f'Loaded {total_product_count} products from WMS')
-            for product in products:
-                base_attributes, extra_attributes = self.filter_extra_attributes(product['custom_attributes'])
-                base_attributes['extraAttributes'] = extra_attributes
-                product['custom_attributes'] = from_dict(
-                    YangoCustomAttributes, base_attributes, config=Config(cast=[Enum])
-                )
-                yield from_dict(YangoProductData, product, config=Config(cast=[Enum]))
-            if len(products) < PRODUCTS_REQUEST_LIMIT:
-                return
+            # Pop raw products off the page while decoding, so each raw dict can be freed once its dataclass
+            # is yielded, instead of keeping the whole raw page alive until its last product is consumed
+            products.reverse()
+            while products:
+                yield products.pop()
+
+    def _decode_product(self, product: dict[str, Any]) -> YangoProductData:
+        base_attributes, extra_attributes = self.filter_extra_attributes(product['custom_attributes'])
+        base_attributes['extraAttributes'] = extra_attributes
+        product['custom_attributes'] = from_dict(YangoCustomAttributes, base_attributes, config=DACITE_ENUM_CONFIG)
+        return from_dict(YangoProductData, product, config=DACITE_ENUM_CONFIG)
 
     async def get_all_products(self, only_active: bool = True) -> dict[str, YangoProductData]:
         """
         Returns all products from WMS as a dict with product_id as a key
         """
-        products: dict[str, YangoProductData] = {}
-        async for product in self.get_product_updates():
-            if only_active and product.status != YangoProductStatus.ACTIVE:
-                if product.product_id in products:
-                    del products[product.product_id]
-                continue
-            products[product.product_id] = product
-        return products
+        # Only the latest update of a product matters: keep the raw updates and decode the survivors once at the end,
+        # so neither superseded nor inactive products are ever decoded.
+        # An inactive update drops the product right away, so only the active set is held in memory
+        latest_products: dict[str, dict[str, Any]] = {}
+        active = YangoProductStatus.ACTIVE.value
+        async for product in self._get_raw_product_updates():
+            if only_active and product['status'] != active:
+                latest_products.pop(product['product_id'], None)
+            else:
+                latest_products[product['product_id']] = product
+
+        return {product_id: self._decode_product(product) for product_id, product in latest_products.items()}
 
     async def create_products(self, products: list[YangoProductData]) -> None:
         created_product_count = 0
-        for products_slice in self.batch_items(products, PRODUCTS_BATCH_SIZE):
-            data = {'products': [asdict(pd) for pd in products_slice]}
+
+        async def create_products_slice(products_slice: list[YangoProductData]) -> None:
+            nonlocal created_product_count
+            data = {'products': products_slice}
             await self.yango_request(PRODUCT_CREATE_ENDPOINT, data)
 
             created_product_count += len(products_slice)
             logger.info(f'Create {created_product_count}/{len(products)} products')
 
+        await self.run_concurrently(create_products_slice, self.batch_items(products, PRODUCTS_BATCH_SIZE))
         logger.info(f'{created_product_count} products are created')
 
+    async def create_product(self, product: YangoProductData) -> None:
+        """
+        Create a single product. Concurrent calls are coalesced into one create_products request
+        """
+        await self.get_batcher(PRODUCT_CREATE_ENDPOINT, self.create_products, PRODUCTS_BATCH_SIZE).submit(product)
+
     async def create_product_media(self, media: YangoProductMedia) -> None:
-        request_data = asdict(media)
+        # Not asdict: it would deep-copy the media buffer, aiohttp streams it as is
+        request_data = {
+            'data': media.data,
+            'product_id': media.product_id,
+            'media_type': media.media_type,
+            'position': media.position,
+        }
         await self.yango_multipart_request(PRODUCT_MEDIA_CREATE_ENDPOINT, data=request_data)
 
     async def update_stocks(self, wms_store_id: str, stocks: list[YangoStockData]) -> None:
         updated_stocks_count = 0
+        # Slices are sent one after another: with the MODIFY mode a product in several slices
+        # must end up with the value that comes last in `stocks`
         for stocks_slice in self.batch_items(stocks, STOCKS_BATCH_SIZE):
             data: dict[str, Any] = {
                 'update_mode': YangoStockUpdateMode.MODIFY,
                 'store_id': wms_store_id,
-                'stocks': [asdict(stock) for stock in stocks_slice],
+                'stocks': stocks_slice,
             }
             await self.yango_request(STOCK_UPDATE_ENDPOINT, data)
 
@@ -245,8 +297,19 @@ class YangoClient(YangoThirdPartyLogisticsClient, YangoPricesClient):
 
         logger.info(f'{updated_stocks_count} stocks are updated')
 
+    async def update_stock(self, wms_store_id: str, stock: YangoStockData) -> None:
+        """
+        Update a single stock. Concurrent calls for the same store are coalesced into one update_stocks request
+        """
+
+        async def update_store_stocks(stocks: list[YangoStockData]) -> None:
+            await self.update_stocks(wms_store_id, stocks)
+
+        batcher = self.get_batcher((STOCK_UPDATE_ENDPOINT, wms_store_id), update_store_stocks, STOCKS_BATCH_SIZE)
+        await batcher.submit(stock)
+
     async def initialize_stocks(self, wms_store_id: str, stocks: list[YangoStockData]) -> None:
-        data: dict[str, Any] = {'store_id': wms_store_id, 'stocks': [asdict(stock) for stock in stocks]}
+        data: dict[str, Any] = {'store_id': wms_store_id, 'stocks': stocks}
         await self.yango_request(STOCK_INITIALIZE_ENDPOINT, data)
 
     async def get_stocks(self, cursor: str | None = None) -> dict[str, Any]:
@@ -264,17 +327,11 @@ class YangoClient(YangoThirdPartyLogisticsClient, YangoPricesClient):
         """
         logger.info('Loading stock updates from WMS')
         total_stock_count = 0
-        while True:
-            data: dict[str, Any] = {'cursor': cursor, 'limit': STOCKS_REQUEST_LIMIT}
-            response = await self.yango_request(STOCK_GET_ENDPOINT, data)
-            stocks = response['stocks']
-            cursor = response['cursor']
+        async for stocks in self.paginate(STOCK_GET_ENDPOINT, 'stocks', STOCKS_REQUEST_LIMIT, cursor):
             total_stock_count += len(stocks)
             logger.info(f'Loaded {total_stock_count} stocks from WMS')
             for stock in stocks:
-                yield from_dict(YangoStockChangeData, stock, config=Config(cast=[Enum]))
-            if len(stocks) < STOCKS_REQUEST_LIMIT:
-                return
+                yield from_dict(YangoStockChangeData, stock, config=DACITE_ENUM_CONFIG)
 
     async def get_all_stocks(self) -> dict[str, dict[str, YangoStockChangeData]]:
         """
@@ -293,8 +350,9 @@ class YangoClient(YangoThirdPartyLogisticsClient, YangoPricesClient):
 
     async def update_product_vat(self, product_vats: list[YangoProductVat]) -> None:
         updated_product_vat_count = 0
+        # Slices are sent one after another, so a product listed twice gets the VAT that comes last
         for product_vats_slice in self.batch_items(product_vats, VAT_BATCH_SIZE):
-            data = {'products_vat': [asdict(vat) for vat in product_vats_slice]}
+            data = {'products_vat': product_vats_slice}
             await self.yango_request(PRODUCT_VAT_UPDATE_ENDPOINT, data)
 
             updated_product_vat_count += len(product_vats_slice)
@@ -304,8 +362,9 @@ class YangoClient(YangoThirdPartyLogisticsClient, YangoPricesClient):
 
     async def create_product_vat(self, product_vats: list[YangoProductVat]) -> None:
         created_product_vat_count = 0
+        # Slices are sent one after another, so a product listed twice gets the VAT that comes last
         for product_vats_slice in self.batch_items(product_vats, VAT_BATCH_SIZE):
-            data = {'products_vat': [asdict(vat) for vat in product_vats_slice]}
+            data = {'products_vat': product_vats_slice}
             await self.yango_request(PRODUCT_VAT_CREATE_ENDPOINT, data)
 
             created_product_vat_count += len(product_vats_slice)
@@ -316,4 +375,4 @@ class YangoClient(YangoThirdPartyLogisticsClient, YangoPricesClient):
     async def get_stores(self) -> list[YangoStoreRecord]:
         response = await self.yango_request(STORES_GET_ENDPOINT, {})
 
-        return [from_dict(YangoStoreRecord, store) for store in response['stores']]
+        return [from_dict(YangoStoreRecord, store, config=DACITE_CONFIG) for store in response['stores']]
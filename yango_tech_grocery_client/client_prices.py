@@ -1,12 +1,19 @@
 import logging
-from collections.abc import AsyncGenerator
-from dataclasses import asdict
+from collections.abc import AsyncGenerator, Iterable
+from itertools import chain
+from operator import attrgetter
 from typing import Any
 
 from dacite import from_dict
 
 from .base_client import BaseYangoClient
-from .constants import DEFAULT_REQUEST_LIMIT, DISCOUNTS_BATCH_SIZE, PRICES_BATCH_SIZE, SERVICE_NAME
+from .constants import (
+    DEFAULT_REQUEST_LIMIT,
+    DISCOUNTS_BATCH_SIZE,
+    PRICE_LIST_LINKS_BATCH_SIZE,
+    PRICES_BATCH_SIZE,
+    SERVICE_NAME,
+)
 from .endpoints import (
     DISCOUNTS_CREATE_ENDPOINT,
     PRICE_GET_ENDPOINT,
@@ -24,19 +31,34 @@ from .schema import (
     YangoPriceListUpdateData,
     YangoStorePriceLinkData,
 )
+from .utils import DACITE_CONFIG
 
 logger = logging.getLogger(SERVICE_NAME)
 
+_get_price_fields = attrgetter('price', 'price_list_id', 'product_id', 'price_per_quantity')
+
+
+def _get_price_data(price_data: Any, price_list_id: str) -> YangoPriceData:
+    # Positional arguments: (product_id, price, price_list_id, price_per_quantity)
+    return YangoPriceData(
+        price_data['product_id'], price_data['price'], price_list_id, price_data.get('price_per_quantity')
+    )
+
 
 def get_price_request_data(price_record: YangoPriceData) -> dict[str, Any]:
+    price, price_list_id, product_id, price_per_quantity = _get_price_fields(price_record)
     return {
-        'price': str(price_record.price),
-        'pricelist_id': price_record.price_list_id,
-        'product_id': price_record.product_id,
-        'price_per_quantity': price_record.price_per_quantity,
+        'price': str(price),
+        'pricelist_id': price_list_id,
+        'product_id': product_id,
+        'price_per_quantity': price_per_quantity,
     }
 
 
+def get_prices_request_data(price_records: Iterable[YangoPriceData]) -> list[dict[str, Any]]:
+    return [get_price_request_data(price_record) for price_record in price_records]
+
+
 class YangoPricesClient(BaseYangoClient):
     """
     Client module for working with Yango prices and price lists.
@@ -45,13 +67,19 @@ class YangoPricesClient(BaseYangoClient):
     """
 
     async def create_price_lists(self, price_lists: list[YangoPriceListUpdateData]) -> None:
-        data = {'pricelists': [asdict(pl) for pl in price_lists]}
+        data = {'pricelists': price_lists}
         await self.yango_request(PRICE_LIST_CREATE_ENDPOINT, data)
 
     async def get_price_lists(self, price_list_ids: list[str]) -> list[dict[str, Any]]:
-        data = {'pricelist_ids': price_list_ids}
-        result = await self.yango_request(PRICE_LIST_GET_ENDPOINT, data)
-        return result['results']
+        async def get_price_lists_slice(ids_slice: list[str]) -> list[dict[str, Any]]:
+            result = await self.yango_request(PRICE_LIST_GET_ENDPOINT, {'pricelist_ids': ids_slice})
+            price_lists: list[dict[str, Any]] = result['results']
+            return price_lists
+
+        results = await self.run_concurrently(
+            get_price_lists_slice, self.batch_items(price_list_ids, DEFAULT_REQUEST_LIMIT)
+        )
+        return list(chain.from_iterable(results))
 
     async def sync_price_lists(self, price_list_ids: set[str]) -> None:
         logger.info(f'{len(price_list_ids)} price lists found')
@@ -71,15 +99,11 @@ class YangoPricesClient(BaseYangoClient):
 
     async def get_price_list_updates(self, cursor: str | None = None) -> AsyncGenerator[YangoPriceListData, None]:
         logger.info('Loading existing products from WMS')
-        while True:
-            data: dict[str, Any] = {'cursor': cursor, 'limit': DEFAULT_REQUEST_LIMIT}
-            response = await self.yango_request(PRICE_LIST_UPDATES_ENDPOINT, data)
-            price_lists = response['pricelists']
-            cursor = response['cursor']
+        async for price_lists in self.paginate(
+            PRICE_LIST_UPDATES_ENDPOINT, 'pricelists', DEFAULT_REQUEST_LIMIT, cursor
+        ):
             for price_list in price_lists:
-                yield from_dict(YangoPriceListData, price_list)
-            if len(price_lists) < DEFAULT_REQUEST_LIMIT:
-                return
+                yield from_dict(YangoPriceListData, price_list, config=DACITE_CONFIG)
 
     async def get_all_price_lists(self) -> dict[str, YangoPriceListData]:
         """
@@ -92,10 +116,14 @@ class YangoPricesClient(BaseYangoClient):
             price_lists[price_list.id] = price_list
         return price_lists
 
-    async def get_store_price_list_links(self, wms_store_ids: list[str]) -> Any:
-        data = {'store_ids': wms_store_ids}
-        result = await self.yango_request(STORE_PRICE_LIST_LINK_GET_ENDPOINT, data)
-        return result['results']
+    async def get_store_price_list_links(self, wms_store_ids: list[str]) -> list[dict[str, Any]]:
+        async def get_links_slice(ids_slice: list[str]) -> list[dict[str, Any]]:
+            result = await self.yango_request(STORE_PRICE_LIST_LINK_GET_ENDPOINT, {'store_ids': ids_slice})
+            links: list[dict[str, Any]] = result['results']
+            return links
+
+        results = await self.run_concurrently(get_links_slice, self.batch_items(wms_store_ids, DEFAULT_REQUEST_LIMIT))
+        return list(chain.from_iterable(results))
 
     async def create_store_price_list_links(self, links: list[YangoStorePriceLinkData]) -> None:
         link_data: list[dict[str, Any]] = []
@@ -114,61 +142,64 @@ class YangoPricesClient(BaseYangoClient):
         ]
         logger.info(f'{len(wms_store_ids_to_create_links)} price lists links need to be created')
 
-        for wms_store_id in wms_store_ids_to_create_links:
-            price_list_id = wms_store_id_to_price_list_id[wms_store_id]
-
-            await self.create_store_price_list_links(
-                [YangoStorePriceLinkData(wms_store_id, price_list_id=price_list_id)]
-            )
+        # The endpoint accepts a list of links, so send them in batches instead of one request per store
+        links = [
+            YangoStorePriceLinkData(wms_store_id, price_list_id=wms_store_id_to_price_list_id[wms_store_id])
+            for wms_store_id in wms_store_ids_to_create_links
+        ]
+        await self.run_concurrently(
+            self.create_store_price_list_links, self.batch_items(links, PRICE_LIST_LINKS_BATCH_SIZE)
+        )
 
     async def get_prices(self, price_list_ids: list[str]) -> dict[str, list[YangoPriceData]]:
         data = {'pricelist_ids': price_list_ids}
         response = await self.yango_request(PRICE_GET_ENDPOINT, data)
-        pricelists = response['results']
         result: dict[str, list[YangoPriceData]] = {}
-        for pricelist in pricelists:
+        for pricelist in response['results']:
             list_id = pricelist['pricelist_id']
-            prices: list[YangoPriceData] = []
-            for price_data in pricelist['prices_data']:
-                prices.append(
-                    YangoPriceData(
-                        product_id=price_data['product_id'],
-                        price=price_data['price'],
-                        price_list_id=list_id,
-                        price_per_quantity=price_data.get('price_per_quantity'),
-                    )
-                )
-            result[list_id] = prices
+            result[list_id] = [_get_price_data(price_data, list_id) for price_data in pricelist['prices_data']]
         return result
 
     async def set_prices(self, prices: list[YangoPriceData]) -> None:
+        # Slices are sent concurrently, so keep only the last row of every (price_list_id, product_id) pair:
+        # otherwise the price set for a product would be the one from the slice finishing last
+        prices = list({(price.price_list_id, price.product_id): price for price in prices}.values())
         set_price_count = 0
-        for prices_slice in self.batch_items(prices, PRICES_BATCH_SIZE):
-            data = {'prices': [get_price_request_data(price) for price in prices_slice]}
+
+        async def set_prices_slice(prices_slice: list[YangoPriceData]) -> None:
+            nonlocal set_price_count
+            data = {'prices': get_prices_request_data(prices_slice)}
             await self.yango_request(PRICE_SET_ENDPOINT, data)
 
             set_price_count += len(prices_slice)
             logger.info(f'Set {set_price_count}/{len(prices)} prices')
 
+        await self.run_concurrently(set_prices_slice, self.batch_items(prices, PRICES_BATCH_SIZE))
         logger.info(f'{set_price_count} prices are set')
 
     async def get_prices_dict(self, price_list_ids: list[str]) -> dict[str, dict[str, YangoPriceData]]:
-        price_lists = await self.get_prices(price_list_ids)
+        # Keyed by product_id straight from the response, instead of building the lists of get_prices first
+        data = {'pricelist_ids': price_list_ids}
+        response = await self.yango_request(PRICE_GET_ENDPOINT, data)
         result: dict[str, dict[str, YangoPriceData]] = {}
-        for pricelist_id, prices in price_lists.items():
-            price_dict = {}
-            for price in prices:
-                price_dict[price.product_id] = price
-            result[pricelist_id] = price_dict
+        for pricelist in response['results']:
+            list_id = pricelist['pricelist_id']
+            result[list_id] = {
+                price_data['product_id']: _get_price_data(price_data, list_id)
+                for price_data in pricelist['prices_data']
+            }
         return result
 
     async def create_discounts(self, discounts: list[YangoDiscountRecord]) -> None:
         created_discount_count = 0
-        for discounts_slice in self.batch_items(discounts, DISCOUNTS_BATCH_SIZE):
-            data = {'discounts': [asdict(d) for d in discounts_slice]}
+
+        async def create_discounts_slice(discounts_slice: list[YangoDiscountRecord]) -> None:
+            nonlocal created_discount_count
+            data = {'discounts': discounts_slice}
             await self.yango_request(DISCOUNTS_CREATE_ENDPOINT, data)
 
             created_discount_count += len(discounts_slice)
             logger.info(f'Create {created_discount_count}/{len(discounts)} discounts')
 
+        await self.run_concurrently(create_discounts_slice, self.batch_items(discounts, DISCOUNTS_BATCH_SIZE))
         logger.info(f'{created_discount_count} discounts are created')
@@ -1,5 +1,5 @@
 import logging
-from dataclasses import asdict
+from typing import Any
 
 from dacite import from_dict
 
@@ -12,14 +12,40 @@ from .endpoints import (
     THIRD_PARTY_LOGISTICS_DELIVERY_STATUS_UPDATE_ENDPOINT,
 )
 from .schema import (
+    YangoThirdPartyLogisticsDeliveryCancelled,
     YangoThirdPartyLogisticsDeliveryCourierInfo,
     YangoThirdPartyLogisticsDeliveryCourierPosition,
+    YangoThirdPartyLogisticsDeliveryCreated,
     YangoThirdPartyLogisticsDeliveryEvents,
     YangoThirdPartyLogisticsDeliveryStatus,
+    YangoThirdPartyLogisticsDeliveryType,
 )
+from .utils import DACITE_CONFIG
 
 logger = logging.getLogger(SERVICE_NAME)
 
+_DeliveryEventData = YangoThirdPartyLogisticsDeliveryCreated | YangoThirdPartyLogisticsDeliveryCancelled
+
+# Keyed by the raw type strings: the event data type is picked by its tag instead of trying every union member
+_DELIVERY_EVENT_DATA_TYPES: dict[Any, type[_DeliveryEventData]] = {
+    YangoThirdPartyLogisticsDeliveryType.CREATE.value: YangoThirdPartyLogisticsDeliveryCreated,
+    YangoThirdPartyLogisticsDeliveryType.CANCEL.value: YangoThirdPartyLogisticsDeliveryCancelled,
+}
+
+
+def _decode_delivery_event_data(event: Any) -> None:
+    """
+    Decode the data of a raw delivery event in place, with the data class picked by its type tag.
+    Malformed events and unknown types are left as they are, for dacite to report them when decoding the response
+    """
+    event_data = event.get('data') if isinstance(event, dict) else None
+    if not isinstance(event_data, dict):
+        return
+
+    data_type = _DELIVERY_EVENT_DATA_TYPES.get(event_data.get('type'))
+    if data_type is not None:
+        event['data'] = from_dict(data_type, event_data, config=DACITE_CONFIG)
+
 
 class YangoThirdPartyLogisticsClient(BaseYangoClient):
     """
@@ -33,8 +59,13 @@ class YangoThirdPartyLogisticsClient(BaseYangoClient):
     ) -> YangoThirdPartyLogisticsDeliveryEvents:
         data = {'cursor': cursor, 'limit': limit}
         response = await self.yango_request(THIRD_PARTY_LOGISTICS_DELIVERIES_EVENTS_QUERY_ENDPOINT, data)
+        events = response.get('events')
+        if isinstance(events, list):
+            for event in events:
+                _decode_delivery_event_data(event)
 
-        return from_dict(YangoThirdPartyLogisticsDeliveryEvents, response)
+        # The envelope is still checked by dacite, the decoded data only has to match its own union member
+        return from_dict(YangoThirdPartyLogisticsDeliveryEvents, response, config=DACITE_CONFIG)
 
     async def update_delivery_status(self, delivery_id: int, status: YangoThirdPartyLogisticsDeliveryStatus) -> None:
         data = {'delivery_id': delivery_id, 'status': status}
@@ -43,11 +74,11 @@ class YangoThirdPartyLogisticsClient(BaseYangoClient):
     async def update_delivery_courier_info(
         self, delivery_id: int, courier_info: YangoThirdPartyLogisticsDeliveryCourierInfo
     ) -> None:
-        data = {'delivery_id': delivery_id, 'courier': asdict(courier_info)}
+        data = {'delivery_id': delivery_id, 'courier': courier_info}
         await self.yango_request(THIRD_PARTY_LOGISTICS_DELIVERY_COURIER_INFO_UPDATE_ENDPOINT, data)
 
     async def update_delivery_courier_position(
         self, delivery_id: int, courier_position: YangoThirdPartyLogisticsDeliveryCourierPosition
     ) -> None:
-        data = {'delivery_id': delivery_id, 'courier_position': asdict(courier_position)}
+        data = {'delivery_id': delivery_id, 'courier_position': courier_position}
         await self.yango_request(THIRD_PARTY_LOGISTICS_DELIVERY_COURIER_POSITION_UPDATE_ENDPOINT, data)
@@ -1,20 +1,33 @@
 SERVICE_NAME = 'yango_client'
+USE_UVLOOP_ENV_VARIABLE = 'YANGO_CLIENT_USE_UVLOOP'
 
 DEFAULT_BATCH_SIZE = 100
 DISCOUNTS_BATCH_SIZE = DEFAULT_BATCH_SIZE
 PRICES_BATCH_SIZE = DEFAULT_BATCH_SIZE
+PRICE_LIST_LINKS_BATCH_SIZE = DEFAULT_BATCH_SIZE
 PRODUCTS_BATCH_SIZE = DEFAULT_BATCH_SIZE
 VAT_BATCH_SIZE = DEFAULT_BATCH_SIZE
 STOCKS_BATCH_SIZE = 1000
+BATCHER_MAX_WAIT = 0.05  # seconds
 
 MAX_RPS = 5
+RATE_LIMITER_CLEANUP_INTERVAL = 60  # seconds
+MAX_CONCURRENT_REQUESTS = MAX_RPS
 MAX_RETRIES = 3
-ERROR_STATUSES_FOR_RETRY = (429, 500)
-RETRY_DELAY = 1  # seconds
+ERROR_STATUSES_FOR_RETRY = frozenset((429, 500))
+RETRY_DELAY = 1  # seconds, base of the exponential backoff
+MAX_RETRY_DELAY = 10  # seconds
+CIRCUIT_BREAKER_FAILURE_THRESHOLD = 5
+CIRCUIT_BREAKER_RECOVERY_TIMEOUT = 30  # seconds
 DEFAULT_REQUEST_LIMIT = 100
 PRODUCTS_REQUEST_LIMIT = 300
 STOCKS_REQUEST_LIMIT = DEFAULT_REQUEST_LIMIT
 
+CONNECTION_POOL_LIMIT = 100
+CONNECTION_POOL_LIMIT_PER_HOST = 30
+DNS_CACHE_TTL = 300  # seconds
+KEEPALIVE_TIMEOUT = 75  # seconds
+
 
 REAL_MONEY_PAYMENT_METHODS = ('cash', 'online', 'card', 'apple_pay')
 LOYALTY_PAYMENT_METHODS = ('loyalty',)
@@ -16,3 +16,11 @@ class YangoRequestError(YangoException):
         self.payload = payload if payload is not None else {}
 
         super().__init__(message)
+
+
+class YangoCircuitOpenError(YangoException):
+    def __init__(self, endpoint: str, retry_after: float) -> None:
+        self.endpoint = endpoint
+        self.retry_after = retry_after
+
+        super().__init__(f'Circuit is open for {endpoint} after repeated failures. Retry in {retry_after:.1f} seconds')
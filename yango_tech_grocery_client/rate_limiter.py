@@ -1,26 +1,36 @@
 import asyncio
 import time
-from collections import defaultdict, deque
+from collections import deque
 
-from .constants import MAX_RPS
+from .constants import MAX_RPS, RATE_LIMITER_CLEANUP_INTERVAL
 
 
 class MethodRateLimiter:
     """
     A rate limiter that tracks requests per auth_token and endpoint combination.
-    Each (auth_token, endpoint) pair has its own rate limit counter using a sliding window approach
+    Each (auth_token, endpoint) pair has its own rate limit counter using a sliding window approach.
+    Only the last `max_rps` timestamps of a pair are kept: the window has room exactly when the oldest
+    of them is more than a second old, so checking a request is O(1)
     """
 
-    def __init__(self, max_rps: int = 5):
+    def __init__(self, max_rps: int = 5, cleanup_interval: float = RATE_LIMITER_CLEANUP_INTERVAL):
         """
         Initialize the rate limiter
 
         Args:
             max_rps: Maximum requests per second per auth_token-endpoint combination
+            cleanup_interval: Seconds between sweeps forgetting idle auth_token-endpoint combinations
         """
         self.max_rps = max_rps
-        self.request_timestamps: dict[tuple[str, str], deque[float]] = defaultdict(deque)
-        self._lock = asyncio.Lock()
+        self.cleanup_interval = cleanup_interval
+        # A plain dict, so probing a key never inserts it. Idle keys are dropped by clean_up_idle_keys
+        self.request_timestamps: dict[tuple[str, str], deque[float]] = {}
+        # One lock per key: a request waiting for its window never holds up other endpoints or tokens
+        self._locks: dict[tuple[str, str], asyncio.Lock] = {}
+        # Requests inside acquire per key. Unlike the lock, it covers the hand-off between a release of the lock
+        # and the next waiter resuming, when the lock already looks free
+        self._waiting: dict[tuple[str, str], int] = {}
+        self._last_cleanup = time.monotonic()
 
     async def acquire(self, endpoint: str, auth_token: str) -> None:
         """
@@ -34,19 +44,68 @@ class MethodRateLimiter:
             auth_token: The authentication auth_token being used
         """
 
-        async with self._lock:
-            key = (auth_token, endpoint)
+        key = (auth_token, endpoint)
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = self._locks[key] = asyncio.Lock()
+
+        self._waiting[key] = self._waiting.get(key, 0) + 1
+        try:
+            async with lock:
+                timestamps = self.get_timestamps(key)
+                now = time.monotonic()
+
+                if len(timestamps) >= self.max_rps and now - timestamps[0] < 1.0:
+                    # Add small buffer to ensure window moves
+                    wait_time = 1.001 - self.get_difference_with_first_request(key, now)
+
+                    if wait_time > 0:
+                        await asyncio.sleep(wait_time)
+                        now = time.monotonic()
+
+                # The deque is bounded by max_rps, so appending drops the timestamp that just left the window
+                timestamps.append(now)
+        finally:
+            waiting = self._waiting[key] - 1
+            if waiting:
+                self._waiting[key] = waiting
+            else:
+                del self._waiting[key]
+
+        self.clean_up_idle_keys_if_due(now)
+
+    def try_acquire_nowait(self, endpoint: str, auth_token: str) -> bool:
+        """
+        Acquire permission without waiting, if the request fits into the current window.
+        Returns False when the caller has to fall back to `acquire`, including while other requests
+        are in `acquire` for the same key, so requests waiting there are never overtaken
 
-            current_rps = self.get_current_rps(endpoint, auth_token)
+        Args:
+            endpoint: The endpoint URL being requested
+            auth_token: The authentication auth_token being used
+        """
+        now = time.monotonic()
+        self.clean_up_idle_keys_if_due(now)
+
+        key = (auth_token, endpoint)
+        if key in self._waiting:
+            return False
 
-            if current_rps >= self.max_rps:
-                # Add small buffer to ensure window moves
-                wait_time = 1.001 - self.get_difference_with_first_request(key, time.time())
+        timestamps = self.get_timestamps(key)
+        if len(timestamps) >= self.max_rps and now - timestamps[0] < 1.0:
+            return False
 
-                if wait_time > 0:
-                    await asyncio.sleep(wait_time)
+        timestamps.append(now)
+        return True
 
-            self.request_timestamps[key].append(time.time())
+    def get_timestamps(self, key: tuple[str, str]) -> deque[float]:
+        """
+        Get the request timestamps of a specific auth_token and endpoint combination, creating them on first use
+        """
+        timestamps = self.request_timestamps.get(key)
+        if timestamps is None:
+            timestamps = self.request_timestamps[key] = deque(maxlen=self.max_rps)
+        return timestamps
 
     def get_current_rps(self, endpoint: str, auth_token: str) -> int:
         """
@@ -60,9 +119,9 @@ class MethodRateLimiter:
             Number of requests in the last second
         """
         key = (auth_token, endpoint)
-        self.clean_up_old_timestamps(key)
+        self.clean_up_old_timestamps(key, time.monotonic())
 
-        return len(self.request_timestamps[key])
+        return len(self.request_timestamps.get(key, ()))
 
     def get_difference_with_first_request(self, key: tuple[str, str], timestamp: float) -> float:
         """
@@ -71,13 +130,41 @@ class MethodRateLimiter:
         """
         return timestamp - self.request_timestamps[key][0]
 
-    def clean_up_old_timestamps(self, key: tuple[str, str]) -> None:
+    def clean_up_old_timestamps(self, key: tuple[str, str], now: float) -> None:
+        """
+        Clean up timestamps older than 1 second before `now`.
+        Timestamps come from the monotonic clock, so wall clock adjustments can't break the window
+        """
+        timestamps = self.request_timestamps.get(key)
+        if timestamps is None:
+            return
+
+        cutoff = now - 1.0
+        while timestamps and timestamps[0] <= cutoff:
+            timestamps.popleft()
+
+        if not timestamps and key not in self._waiting:
+            del self.request_timestamps[key]
+
+    def clean_up_idle_keys_if_due(self, now: float) -> None:
+        """
+        Run clean_up_idle_keys once `cleanup_interval` seconds have passed since the last sweep.
+        Called from both acquire paths, as most requests only go through try_acquire_nowait
+        """
+        if now - self._last_cleanup >= self.cleanup_interval:
+            self.clean_up_idle_keys(now)
+
+    def clean_up_idle_keys(self, now: float) -> None:
         """
-        Clean up old timestamps older than 1 second
+        Forget auth_token and endpoint combinations without requests in the last second,
+        so long-running clients with rotating auth tokens don't keep their state forever
         """
-        now = time.time()
-        while self.request_timestamps[key] and self.get_difference_with_first_request(key, now) >= 1.0:
-            self.request_timestamps[key].popleft()
+        self._last_cleanup = now
+        for key in list(self.request_timestamps):
+            self.clean_up_old_timestamps(key, now)
+        for key in list(self._locks):
+            if key not in self.request_timestamps and key not in self._waiting:
+                del self._locks[key]
 
 
 yango_rate_limiter = MethodRateLimiter(max_rps=MAX_RPS)
@@ -110,7 +110,7 @@ class YangoStockShelfType(str, Enum):
 AttributeTranslations = dict[str, str]  # {lang_code: name}
 
 
-@dataclass
+@dataclass(slots=True)
 class YangoShoppingCartItem:
     product_id: str
     quantity: int
@@ -119,7 +119,7 @@ class YangoShoppingCartItem:
     vat: str | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class YangoOrderCart:
     items: list[YangoShoppingCartItem]
     total_price: str
@@ -130,13 +130,13 @@ class YangoOrderCart:
     total_vat: str | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Point:
     lat: float
     lon: float
 
 
-@dataclass
+@dataclass(slots=True)
 class YangoAddress:
     city: str | None = None
     country: str | None = None
@@ -144,26 +144,26 @@ class YangoAddress:
     street: str | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class YangoDeliveryAddress:
     position: Point
     address: YangoAddress | None = None
     comment: str | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class YangoDeliverySlot:
     start: str
     end: str
 
 
-@dataclass
+@dataclass(slots=True)
 class YangoDeliveryProperties:
     type: str
     slot: YangoDeliverySlot | None = None
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class YangoOrderRecord:
     order_id: str
     cart: YangoOrderCart | None = None
@@ -177,74 +177,74 @@ class YangoOrderRecord:
     human_order_id: str | None = None
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class YangoOrderDetails(YangoOrderRecord):
     create_time: str
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class YangoOrderStateQuery(YangoOrderRecord):
     order_id: str
     query_result: str
     state: YangoOrderState | None = None
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class YangoStateChangeEventData:
     type: Literal[YangoOrderEventType.STATE_CHANGE]
     current_state: YangoOrderState | str
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class YangoNewOrderEventData:
     type: Literal[YangoOrderEventType.NEW_ORDER]
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class YangoReceiptIssuedEventData:
     type: Literal[YangoOrderEventType.RECEIPT_ISSUED]
     receipt_id: str
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class YangoOrderEvent:
     data: YangoStateChangeEventData | YangoNewOrderEventData | YangoReceiptIssuedEventData
     order_id: str
     occurred: str
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class YangoOrderEventQueryResponse:
     cursor: str
     orders_events: list[YangoOrderEvent]
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class YangoReceiptOrder:
     id: str
     create_time: str | None = None
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class YangoReceiptStore:
     id: str | None = None
     name: str | None = None
     address: str | None = None
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class YangoReceiptItemVat:
     vat_amount: str
     vat_percent: str
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class YangoReceiptPaymentAmount:
     payment_id: str
     price: str
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class YangoReceiptItemPayment:
     quantity: str
     discount_amount: str = '0'
@@ -252,7 +252,7 @@ class YangoReceiptItemPayment:
     barcode: str | None = None
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class YangoReceiptProductItem:
     item_type: str
     name: AttributeTranslations
@@ -260,7 +260,7 @@ class YangoReceiptProductItem:
     vat: str | None = None
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class YangoReceiptNotProductItem:  # delivery, tips or service fee
     item_type: str
     title: AttributeTranslations | None = None
@@ -268,13 +268,13 @@ class YangoReceiptNotProductItem:  # delivery, tips or service fee
     vat: str | None = None
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class YangoReceiptClientFullName:
     first_name: str | None = None
     last_name: str | None = None
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class YangoReceiptClient:
     full_name: YangoReceiptClientFullName | None = None
     phone_number: str | None = None
@@ -282,7 +282,7 @@ class YangoReceiptClient:
     delivery_address: YangoAddress | None = None
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class YangoPaymentMethod:
     payment_type: str  # cash, online, apple_pay, etc
 
@@ -292,7 +292,7 @@ class YangoReceiptType(str, Enum):
     REFUND = 'refund'
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class YangoReceiptRecord:
     receipt_id: str
     order: YangoReceiptOrder
@@ -311,23 +311,23 @@ class YangoReceiptClientField(str, Enum):
     DELIVERY_ADDRESS = 'delivery_address'
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class YangoGetReceiptResponse:
     receipts: list[YangoReceiptRecord]
 
 
-@dataclass
+@dataclass(slots=True)
 class YangoPriceListUpdateData:
     id: str
     name: str
 
 
-@dataclass
+@dataclass(slots=True)
 class YangoPriceListData(YangoPriceListUpdateData):
     status: YangoPriceListStatus | str
 
 
-@dataclass
+@dataclass(slots=True)
 class YangoPriceData:
     product_id: str
     price: float
@@ -335,19 +335,19 @@ class YangoPriceData:
     price_per_quantity: int = 1
 
 
-@dataclass
+@dataclass(slots=True)
 class YangoStorePriceLinkData:
     wms_store_id: str
     price_list_id: str
 
 
-@dataclass
+@dataclass(slots=True)
 class YangoCustomAttributes:
     longName: dict[str, str]
     shortNameLoc: dict[str, str]
     markCount: float
     markCountUnitList: str  # YangoMarkCountUnitList
-    barcode: list[str] = field(default_factory=list[str])
+    barcode: list[str] = field(default_factory=list)
     images: list[str] | None = None
     descriptionLoc: dict[str, str] | None = None
     nomenclatureType: YangoNomenclatureType | str | None = None
@@ -358,7 +358,7 @@ class YangoCustomAttributes:
     extraAttributes: dict[str, Any] | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class YangoProductData:
     custom_attributes: YangoCustomAttributes
     master_category: str
@@ -367,27 +367,27 @@ class YangoProductData:
     is_meta: bool
 
 
-@dataclass
+@dataclass(slots=True)
 class YangoStockData:
     product_id: str
     quantity: int
 
 
-@dataclass
+@dataclass(slots=True)
 class YangoStockChangeData(YangoStockData):
     shelf_type: YangoStockShelfType | str
     store_id: str
 
 
-@dataclass
+@dataclass(slots=True)
 class YangoProductMedia:
-    data: io.BytesIO
+    data: io.BytesIO | bytes | memoryview
     product_id: str
     media_type: YangoMediaType | str
     position: YangoMediaPosition | str
 
 
-@dataclass
+@dataclass(slots=True)
 class YangoDiscountRecord:
     product_id: str
     store_id: str
@@ -395,13 +395,13 @@ class YangoDiscountRecord:
     discount_value: dict[str, str]
 
 
-@dataclass
+@dataclass(slots=True)
 class YangoProductVat:
     product_id: str
     vat: str
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class YangoStoreRecord:
     id: str
     status: str
@@ -410,7 +410,7 @@ class YangoStoreRecord:
     name: str | None = None
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class YangoStoreLocation:
     position: Point
     address: str | None = None
@@ -419,7 +419,7 @@ class YangoStoreLocation:
 ### 3pl
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class YangoThirdPartyLogisticsDeliveryItem:
     price: str
     product_id: str
@@ -431,7 +431,7 @@ class YangoThirdPartyLogisticsDeliveryItem:
     width: int | None = None
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class YangoThirdPartyLogisticsDeliveryLocation:
     position: Point
     building_name: str | None = None
@@ -454,7 +454,7 @@ class YangoThirdPartyLogisticsDeliveryType(str, Enum):
     CANCEL = 'cancel'
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class YangoThirdPartyLogisticsDeliveryCreated:
     type: Literal[YangoThirdPartyLogisticsDeliveryType.CREATE]
     client_phone: str
@@ -473,20 +473,20 @@ class YangoThirdPartyLogisticsDeliveryCreated:
     total_price: str | None = None
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class YangoThirdPartyLogisticsDeliveryCancelled:
     type: Literal[YangoThirdPartyLogisticsDeliveryType.CANCEL]
     reason: str | None = None
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class YangoThirdPartyLogisticsDeliveryEvent:
     data: YangoThirdPartyLogisticsDeliveryCreated | YangoThirdPartyLogisticsDeliveryCancelled
     delivery_id: int
     occurred: str
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class YangoThirdPartyLogisticsDeliveryEvents:
     events: list[YangoThirdPartyLogisticsDeliveryEvent]
     cursor: str
@@ -503,14 +503,14 @@ class YangoThirdPartyLogisticsDeliveryStatus(str, Enum):
     CANCELED = 'canceled'
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class YangoThirdPartyLogisticsDeliveryCourierName:
     first_name: str
     patronymic: str | None = None
     surname: str | None = None
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class YangoThirdPartyLogisticsDeliveryCourierInfo:
     id: str
     name: YangoThirdPartyLogisticsDeliveryCourierName
@@ -524,7 +524,7 @@ class YangoThirdPartyLogisticsDeliveryCourierInfo:
     transport_type: str | None = None
 
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class YangoThirdPartyLogisticsDeliveryCourierPosition:
     location: Point
     timestamp: str
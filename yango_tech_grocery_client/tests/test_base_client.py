@@ -0,0 +1,215 @@
+import asyncio
+import gc
+import io
+import unittest
+from contextlib import aclosing
+from typing import Any
+from unittest import mock
+
+import aiohttp
+import orjson
+
+from yango_tech_grocery_client import YangoClient
+from yango_tech_grocery_client.exceptions import YangoRequestError
+
+
+class TestBaseYangoClient(unittest.IsolatedAsyncioTestCase):
+    """
+    Test suite for BaseYangoClient class.
+    Run `python -m unittest -v <test_path>` to run the test.
+    For example: `python -m unittest -v yango_tech_grocery_client.tests.test_base_client`
+    """
+
+    async def asyncSetUp(self) -> None:
+        self.client = YangoClient(domain='https://example.com', auth_token='test_token')
+
+    async def asyncTearDown(self) -> None:
+        await self.client.close()
+
+    def stub_multipart_post(self, failures: int = 0) -> list[bytes]:
+        """Replace _post with a stub recording the uploaded file of every attempt, failing the first `failures`"""
+        uploads: list[bytes] = []
+
+        async def post(endpoint: str, headers: dict[str, str], data: Any, request_body: bytes | None = None) -> Any:
+            body = await data().as_bytes()
+            uploads.append(body.split(b'filename="data"\r\n\r\n', 1)[1].split(b'\r\n--', 1)[0])
+            if len(uploads) <= failures:
+                raise YangoRequestError('error', endpoint, 500, '')
+            return {}
+
+        self.client._post = post  # type: ignore[method-assign]
+        return uploads
+
+    @staticmethod
+    def make_response(status: int, body: bytes) -> aiohttp.ClientResponse:
+        resp = mock.Mock(spec=aiohttp.ClientResponse)
+        resp.status = status
+        resp.headers = {'x-yatraceid': 'trace', 'x-yarequestid': 'request'}
+        resp.url = 'https://example.com/test/endpoint'
+        resp.read = mock.AsyncMock(return_value=body)
+        resp.text = mock.AsyncMock(return_value=body.decode())
+        return resp
+
+    async def test_process_yango_response_decodes_json(self) -> None:
+        """Test that a successful response is decoded without touching the request body"""
+        resp = self.make_response(200, b'{"items": [1, 2]}')
+
+        result = await self.client.process_yango_response(resp, request_body=b'not json')
+
+        self.assertEqual(result, {'items': [1, 2]})
+
+    async def test_process_yango_response_returns_none_for_blank_body(self) -> None:
+        """Test that a successful response with a blank body returns None"""
+        resp = self.make_response(200, b'  \n')
+
+        self.assertIsNone(await self.client.process_yango_response(resp))
+
+    async def test_process_yango_response_raises_for_non_json_body(self) -> None:
+        """Test that a successful status with a non-JSON body raises YangoRequestError chained from the decode error"""
+        resp = self.make_response(200, b'<html>Bad gateway</html>')
+
+        with self.assertRaises(YangoRequestError) as context:
+            await self.client.process_yango_response(resp)
+
+        self.assertEqual(context.exception.status, 200)
+        self.assertEqual(context.exception.response_text, '<html>Bad gateway</html>')
+        self.assertIsInstance(context.exception.__cause__, orjson.JSONDecodeError)
+
+    async def test_process_yango_response_decodes_payload_on_failure(self) -> None:
+        """Test that the request body is decoded into the error payload when the request failed"""
+        resp = self.make_response(500, b'Internal error')
+
+        with self.assertRaises(YangoRequestError) as context:
+            await self.client.process_yango_response(resp, request_body=orjson.dumps({'product_ids': ['product']}))
+
+        self.assertEqual(context.exception.status, 500)
+        self.assertEqual(context.exception.payload, {'product_ids': ['product']})
+        self.assertIsNone(context.exception.__cause__)
+
+    async def test_multipart_request_sends_rewound_buffer(self) -> None:
+        """Test that a rewound BytesIO is uploaded whole and stays writable"""
+        uploads = self.stub_multipart_post()
+        data = io.BytesIO()
+        data.write(b'media content')
+        data.seek(0)
+
+        await self.client.yango_multipart_request('/test/endpoint', {'data': data, 'product_id': 'product'})
+
+        self.assertEqual(uploads, [b'media content'])
+        data.write(b'more')
+
+    async def test_multipart_request_sends_buffer_from_position(self) -> None:
+        """Test that a BytesIO is uploaded from its current position, like a stream"""
+        uploads = self.stub_multipart_post()
+        data = io.BytesIO(b'header|media content')
+        data.seek(len(b'header|'))
+
+        await self.client.yango_multipart_request('/test/endpoint', {'data': data})
+
+        self.assertEqual(uploads, [b'media content'])
+
+    async def test_multipart_request_resends_buffer_on_retry(self) -> None:
+        """Test that every retry uploads the same bytes and the buffer is released after a failure"""
+        uploads = self.stub_multipart_post(failures=1)
+        data = io.BytesIO(b'header|media content')
+        data.seek(len(b'header|'))
+
+        with mock.patch('yango_tech_grocery_client.utils.get_retry_delay', return_value=0):
+            await self.client.yango_multipart_request('/test/endpoint', {'data': data})
+
+        self.assertEqual(uploads, [b'media content', b'media content'])
+        data.truncate(0)
+
+    def stub_pages(self, pages: dict[str | None, Any]) -> list[str | None]:
+        """Replace yango_request with a stub serving `pages` by cursor, a page may also be an error or a coroutine"""
+        cursors: list[str | None] = []
+
+        async def yango_request(endpoint: str, data: Any) -> Any:
+            cursors.append(data['cursor'])
+            page = pages[data['cursor']]
+            if isinstance(page, BaseException):
+                raise page
+            return await page() if callable(page) else page
+
+        self.client.yango_request = yango_request  # type: ignore[method-assign]
+        return cursors
+
+    async def test_paginate_stops_after_short_page(self) -> None:
+        """Test that pages are yielded in order and no page is requested after a short one"""
+        cursors = self.stub_pages(
+            {None: {'items': [1, 2], 'cursor': 'second'}, 'second': {'items': [3], 'cursor': 'third'}}
+        )
+
+        pages = [page async for page in self.client.paginate('/test/endpoint', 'items', limit=2)]
+
+        self.assertEqual(pages, [[1, 2], [3]])
+        self.assertEqual(cursors, [None, 'second'])
+
+    async def test_paginate_cancels_next_page_on_early_exit(self) -> None:
+        """Test that the page still in flight is cancelled when the caller stops iterating"""
+        cancelled = []
+
+        async def never_answered() -> Any:
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+
+        cursors = self.stub_pages({None: {'items': [1, 2], 'cursor': 'second'}, 'second': never_answered})
+
+        async with aclosing(self.client.paginate('/test/endpoint', 'items', limit=2)) as pages:
+            async for _ in pages:
+                await asyncio.sleep(0)
+                break
+        # Let the cancelled request run up to its CancelledError
+        await asyncio.sleep(0)
+
+        self.assertEqual(cursors, [None, 'second'])
+        self.assertEqual(cancelled, [True])
+
+    async def test_paginate_retrieves_failed_next_page_on_early_exit(self) -> None:
+        """Test that a next page which already failed doesn't log 'exception was never retrieved' on early exit"""
+        unhandled: list[dict[str, Any]] = []
+        asyncio.get_running_loop().set_exception_handler(lambda loop, context: unhandled.append(context))
+        self.stub_pages(
+            {None: {'items': [1, 2], 'cursor': 'second'}, 'second': YangoRequestError('error', '', 500, '')}
+        )
+
+        async with aclosing(self.client.paginate('/test/endpoint', 'items', limit=2)) as pages:
+            async for _ in pages:
+                await asyncio.sleep(0)
+                break
+        del pages
+        gc.collect()
+
+        self.assertEqual(unhandled, [])
+
+    async def test_run_concurrently_keeps_order(self) -> None:
+        """Test that results are returned in the order of the arguments, not of completion"""
+
+        async def func(arg: int) -> int:
+            await asyncio.sleep(0.01 * (3 - arg))
+            return arg * 10
+
+        self.assertEqual(await self.client.run_concurrently(func, [0, 1, 2]), [0, 10, 20])
+
+    async def test_run_concurrently_cancels_siblings_on_failure(self) -> None:
+        """Test that the first failure is raised and the calls still in flight are cancelled"""
+        cancelled = []
+
+        async def func(arg: int) -> int:
+            if arg == 0:
+                await asyncio.sleep(0)
+                raise YangoRequestError('error', '', 500, '')
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                cancelled.append(arg)
+                raise
+            return arg
+
+        with self.assertRaises(YangoRequestError):
+            await self.client.run_concurrently(func, [0, 1, 2])
+
+        self.assertEqual(sorted(cancelled), [1, 2])
@@ -0,0 +1,72 @@
+import asyncio
+import unittest
+
+from yango_tech_grocery_client.batcher import AsyncBatcher
+
+
+class TestAsyncBatcher(unittest.IsolatedAsyncioTestCase):
+    """
+    Test suite for AsyncBatcher class.
+    Run `python -m unittest -v <test_path>` to run the test.
+    For example: `python -m unittest -v yango_tech_grocery_client.tests.test_batcher`
+    """
+
+    async def asyncSetUp(self) -> None:
+        self.batches: list[list[int]] = []
+
+    async def flush(self, items: list[int]) -> None:
+        self.batches.append(items)
+
+    async def test_batcher_coalesces_concurrent_items(self) -> None:
+        """Test that concurrent submits are sent as one batch after the wait window"""
+        batcher = AsyncBatcher(self.flush, max_batch_size=10, max_wait=0.01)
+
+        await asyncio.gather(*(batcher.submit(i) for i in range(5)))
+
+        self.assertEqual(self.batches, [[0, 1, 2, 3, 4]])
+
+    async def test_batcher_splits_by_max_batch_size(self) -> None:
+        """Test that a full batch is sent right away without waiting for the window"""
+        batcher = AsyncBatcher(self.flush, max_batch_size=2, max_wait=10)
+
+        await asyncio.wait_for(asyncio.gather(*(batcher.submit(i) for i in range(4))), timeout=1)
+
+        self.assertEqual(self.batches, [[0, 1], [2, 3]])
+
+    async def test_batcher_propagates_errors_to_all_waiters(self) -> None:
+        """Test that every caller of a failed batch gets the error"""
+
+        async def failing_flush(items: list[int]) -> None:
+            raise ValueError('failed')
+
+        batcher = AsyncBatcher(failing_flush, max_batch_size=10, max_wait=0.01)
+
+        results = await asyncio.gather(*(batcher.submit(i) for i in range(3)), return_exceptions=True)
+
+        self.assertEqual(len(results), 3)
+        for result in results:
+            self.assertIsInstance(result, ValueError)
+
+    async def test_batcher_close_sends_buffered_items(self) -> None:
+        """Test that close sends the buffered items without waiting for the window"""
+        batcher = AsyncBatcher(self.flush, max_batch_size=10, max_wait=10)
+
+        task = asyncio.ensure_future(batcher.submit(1))
+        await asyncio.sleep(0)
+        await asyncio.wait_for(batcher.close(), timeout=1)
+        await task
+
+        self.assertEqual(self.batches, [[1]])
+
+    async def test_batcher_reports_idle_after_last_flush(self) -> None:
+        """Test that on_idle is called once all batches are sent and nothing is buffered"""
+        idle_calls: list[int] = []
+        batcher = AsyncBatcher(
+            self.flush, max_batch_size=2, max_wait=0.01, on_idle=lambda: idle_calls.append(len(self.batches))
+        )
+
+        await asyncio.gather(*(batcher.submit(i) for i in range(3)))
+        await asyncio.sleep(0)
+
+        self.assertEqual(self.batches, [[0, 1], [2]])
+        self.assertEqual(idle_calls, [2])
@@ -0,0 +1,136 @@
+import asyncio
+import time
+import unittest
+
+import aiohttp
+
+from yango_tech_grocery_client.circuit_breaker import CircuitBreaker
+from yango_tech_grocery_client.exceptions import YangoCircuitOpenError, YangoRequestError
+
+
+class TestCircuitBreaker(unittest.IsolatedAsyncioTestCase):
+    """
+    Test suite for CircuitBreaker class.
+    Run `python -m unittest -v <test_path>` to run the test.
+    For example: `python -m unittest -v yango_tech_grocery_client.tests.test_circuit_breaker`
+    """
+
+    def test_circuit_breaker_opens_after_threshold(self) -> None:
+        """Test that the circuit opens only after the configured number of consecutive failures"""
+        breaker = CircuitBreaker(failure_threshold=3, recovery_timeout=10)
+        endpoint = '/test/endpoint'
+        token = 'test_token'
+
+        for _ in range(2):
+            breaker.record_failure(endpoint, token)
+        breaker.check(endpoint, token)
+
+        breaker.record_failure(endpoint, token)
+        with self.assertRaises(YangoCircuitOpenError):
+            breaker.check(endpoint, token)
+
+    def test_circuit_breaker_success_resets_failures(self) -> None:
+        """Test that a success in between failures resets the counter"""
+        breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=10)
+        endpoint = '/test/endpoint'
+        token = 'test_token'
+
+        breaker.record_failure(endpoint, token)
+        breaker.record_success(endpoint, token)
+        breaker.record_failure(endpoint, token)
+
+        breaker.check(endpoint, token)
+
+    def test_circuit_breaker_recovery(self) -> None:
+        """Test that requests are let through after the recovery timeout and a success closes the circuit"""
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0.1)
+        endpoint = '/test/endpoint'
+        token = 'test_token'
+
+        breaker.record_failure(endpoint, token)
+        with self.assertRaises(YangoCircuitOpenError):
+            breaker.check(endpoint, token)
+
+        time.sleep(0.15)
+        breaker.check(endpoint, token)
+
+        breaker.record_success(endpoint, token)
+        breaker.record_failure(endpoint, token)
+        with self.assertRaises(YangoCircuitOpenError):
+            breaker.check(endpoint, token)
+
+    def test_circuit_breaker_independent_keys(self) -> None:
+        """Test that an open circuit for one endpoint or token doesn't affect the others"""
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=10)
+
+        breaker.record_failure('/endpoint/1', 'token1')
+
+        breaker.check('/endpoint/2', 'token1')
+        breaker.check('/endpoint/1', 'token2')
+        with self.assertRaises(YangoCircuitOpenError):
+            breaker.check('/endpoint/1', 'token1')
+
+    async def test_circuit_breaker_half_open_admits_single_probe(self) -> None:
+        """Test that after the recovery timeout only one of the concurrent requests is let through"""
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0.1)
+        endpoint = '/test/endpoint'
+        token = 'test_token'
+        probe_sent = asyncio.Event()
+        probe_answered = asyncio.Event()
+
+        breaker.record_failure(endpoint, token)
+        await asyncio.sleep(0.15)
+
+        async def request() -> None:
+            with breaker.guard(endpoint, token):
+                probe_sent.set()
+                await probe_answered.wait()
+
+        probe = asyncio.ensure_future(request())
+        await probe_sent.wait()
+
+        results = await asyncio.gather(*(request() for _ in range(3)), return_exceptions=True)
+        for result in results:
+            self.assertIsInstance(result, YangoCircuitOpenError)
+
+        probe_answered.set()
+        await probe
+        breaker.check(endpoint, token)
+        breaker.check(endpoint, token)
+
+    async def test_circuit_breaker_failed_probe_reopens(self) -> None:
+        """Test that a failed probe reopens the circuit for the whole recovery timeout"""
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0.1)
+        endpoint = '/test/endpoint'
+        token = 'test_token'
+
+        breaker.record_failure(endpoint, token)
+        await asyncio.sleep(0.15)
+
+        with self.assertRaises(aiohttp.ClientConnectionError):
+            with breaker.guard(endpoint, token):
+                raise aiohttp.ClientConnectionError()
+
+        with self.assertRaises(YangoCircuitOpenError) as context:
+            breaker.check(endpoint, token)
+        self.assertGreater(context.exception.retry_after, 0)
+
+    def test_circuit_breaker_guard_outcomes(self) -> None:
+        """Test that server errors, connection errors and timeouts count as failures, bad requests don't"""
+        breaker = CircuitBreaker(failure_threshold=3, recovery_timeout=10)
+        endpoint = '/test/endpoint'
+        token = 'test_token'
+
+        errors: list[Exception] = [
+            YangoRequestError('error', endpoint, 500, ''),
+            YangoRequestError('error', endpoint, 400, ''),
+            aiohttp.ClientConnectionError(),
+            asyncio.TimeoutError(),
+        ]
+        for error in errors:
+            with self.assertRaises(type(error)):
+                with breaker.guard(endpoint, token):
+                    raise error
+
+        with self.assertRaises(YangoCircuitOpenError):
+            breaker.check(endpoint, token)
@@ -0,0 +1,43 @@
+import unittest
+from typing import Any
+
+from yango_tech_grocery_client import YangoClient
+from yango_tech_grocery_client.constants import PRICES_BATCH_SIZE
+from yango_tech_grocery_client.endpoints import PRICE_SET_ENDPOINT
+from yango_tech_grocery_client.schema import YangoPriceData
+
+
+class TestYangoPricesClient(unittest.IsolatedAsyncioTestCase):
+    """
+    Test suite for YangoPricesClient class.
+    Run `python -m unittest -v <test_path>` to run the test.
+    For example: `python -m unittest -v yango_tech_grocery_client.tests.test_client_prices`
+    """
+
+    async def asyncSetUp(self) -> None:
+        self.client = YangoClient(domain='https://example.com', auth_token='test_token')
+        self.requests: list[tuple[str, Any]] = []
+
+        async def yango_request(endpoint: str, data: Any) -> Any:
+            self.requests.append((endpoint, data))
+            return {}
+
+        self.client.yango_request = yango_request  # type: ignore[method-assign]
+
+    async def asyncTearDown(self) -> None:
+        await self.client.close()
+
+    async def test_set_prices_keeps_last_duplicate_across_slices(self) -> None:
+        """Test that a price repeated in a later slice is sent once, with the last value"""
+        prices = [YangoPriceData(f'product_{i}', 1.0, 'price_list') for i in range(PRICES_BATCH_SIZE)]
+        prices.append(YangoPriceData('product_0', 2.0, 'price_list'))
+        prices.append(YangoPriceData('product_0', 3.0, 'other_price_list'))
+
+        await self.client.set_prices(prices)
+
+        sent = [price for endpoint, data in self.requests if endpoint == PRICE_SET_ENDPOINT for price in data['prices']]
+        self.assertEqual(len(sent), PRICES_BATCH_SIZE + 1)
+        self.assertEqual(
+            [(price['pricelist_id'], price['price']) for price in sent if price['product_id'] == 'product_0'],
+            [('price_list', '2.0'), ('other_price_list', '3.0')],
+        )
@@ -23,11 +23,11 @@ class TestRateLimiter(unittest.IsolatedAsyncioTestCase):
         token = 'test_token'
 
         # Make max_rps requests - should all pass immediately
-        start_time = time.time()
+        start_time = time.monotonic()
         for _ in range(max_rps):
             await limiter.acquire(endpoint, token)
 
-        elapsed = time.time() - start_time
+        elapsed = time.monotonic() - start_time
         # Should be almost immediate (less than 0.1 seconds)
         self.assertLess(elapsed, 0.1, 'Expected immediate execution')
 
@@ -43,13 +43,13 @@ class TestRateLimiter(unittest.IsolatedAsyncioTestCase):
         token = 'test_token'
 
         # Make max_rps requests - should pass immediately
-        start_time = time.time()
+        start_time = time.monotonic()
         for _ in range(max_rps):
             await limiter.acquire(endpoint, token)
 
         # Make max_rps + 1 request - should wait for the oldest request to expire
         await limiter.acquire(endpoint, token)
-        elapsed = time.time() - start_time
+        elapsed = time.monotonic() - start_time
 
         # Should wait about 1 second (between 0.9 and 1.1 seconds is reasonable)
         self.assertGreaterEqual(elapsed, 0.9, 'Expected to wait at least 0.9 seconds')
@@ -64,7 +64,7 @@ class TestRateLimiter(unittest.IsolatedAsyncioTestCase):
         token = 'test_token'
 
         # Make max_rps requests for endpoint1 - should pass immediately
-        start_time = time.time()
+        start_time = time.monotonic()
         for _ in range(max_rps):
             await limiter.acquire(endpoint1, token)
 
@@ -72,7 +72,7 @@ class TestRateLimiter(unittest.IsolatedAsyncioTestCase):
         for _ in range(max_rps):
             await limiter.acquire(endpoint2, token)
 
-        elapsed = time.time() - start_time
+        elapsed = time.monotonic() - start_time
         # Should be almost immediate since they're different endpoints
         self.assertLess(elapsed, 0.1, 'Expected immediate execution')
 
@@ -91,7 +91,7 @@ class TestRateLimiter(unittest.IsolatedAsyncioTestCase):
         token2 = 'token2'
 
         # Make max_rps requests for token1 - should pass immediately
-        start_time = time.time()
+        start_time = time.monotonic()
         for _ in range(max_rps):
             await limiter.acquire(endpoint, token1)
 
@@ -99,7 +99,7 @@ class TestRateLimiter(unittest.IsolatedAsyncioTestCase):
         for _ in range(max_rps):
             await limiter.acquire(endpoint, token2)
 
-        elapsed = time.time() - start_time
+        elapsed = time.monotonic() - start_time
         # Should be almost immediate since they're different tokens
         self.assertLess(elapsed, 0.1, 'Expected immediate execution')
 
@@ -124,9 +124,9 @@ class TestRateLimiter(unittest.IsolatedAsyncioTestCase):
         await asyncio.sleep(1.1)
 
         # Make another request - should pass immediately since old requests are cleaned up
-        start_time = time.time()
+        start_time = time.monotonic()
         await limiter.acquire(endpoint, token)
-        elapsed = time.time() - start_time
+        elapsed = time.monotonic() - start_time
 
         self.assertLess(elapsed, 0.1, 'Expected immediate execution after cleanup')
 
@@ -142,10 +142,10 @@ class TestRateLimiter(unittest.IsolatedAsyncioTestCase):
         token = 'test_token'
 
         # Start 5 concurrent requests
-        start_time = time.time()
+        start_time = time.monotonic()
         tasks = [limiter.acquire(endpoint, token) for _ in range(max_rps + 2)]
         await asyncio.gather(*tasks)
-        elapsed = time.time() - start_time
+        elapsed = time.monotonic() - start_time
 
         # First max_rps requests should be immediate, last 2 should wait
         # The wait time should be around 1 second
@@ -160,7 +160,7 @@ class TestRateLimiter(unittest.IsolatedAsyncioTestCase):
         token = 'test_token'
 
         # Make max_rps requests at different times
-        start_time = time.time()
+        start_time = time.monotonic()
         await limiter.acquire(endpoint, token)  # Request 1 at time 0
 
         await asyncio.sleep(0.3)  # Wait 0.3 seconds
@@ -168,7 +168,7 @@ class TestRateLimiter(unittest.IsolatedAsyncioTestCase):
 
         # Make max_rps request - should wait for the first request to expire (0.7 seconds from now)
         await limiter.acquire(endpoint, token)
-        elapsed = time.time() - start_time
+        elapsed = time.monotonic() - start_time
 
         # Should wait about 1 second total (0.3 + 0.7)
         self.assertGreaterEqual(elapsed, 0.9, 'Expected to wait at least 0.9 seconds')
@@ -182,7 +182,7 @@ class TestRateLimiter(unittest.IsolatedAsyncioTestCase):
         token = 'test_token'
 
         # Make only max_rps - 3 requests (well below the max_rps limit)
-        start_time = time.time()
+        start_time = time.monotonic()
         for _ in range(max_rps - 3):
             await limiter.acquire(endpoint, token)
 
@@ -190,15 +190,15 @@ class TestRateLimiter(unittest.IsolatedAsyncioTestCase):
         await asyncio.sleep(0.5)
 
         # Make another request - should execute immediately since we're still within limits
-        request_start_time = time.time()
+        request_start_time = time.monotonic()
         await limiter.acquire(endpoint, token)
-        request_elapsed = time.time() - request_start_time
+        request_elapsed = time.monotonic() - request_start_time
 
         # This request should execute immediately (less than 0.01 seconds)
         self.assertLess(request_elapsed, 0.01, 'Expected immediate execution')
 
         # Total time should be around 0.5 seconds (the wait time)
-        total_elapsed = time.time() - start_time
+        total_elapsed = time.monotonic() - start_time
         self.assertGreaterEqual(total_elapsed, 0.4, 'Expected total time at least 0.4 seconds')
         self.assertLessEqual(total_elapsed, 0.6, 'Expected total time at most 0.6 seconds')
 
@@ -223,9 +223,9 @@ class TestRateLimiter(unittest.IsolatedAsyncioTestCase):
 
         # The first request (at time 0) should now be outside the 1-second window
         # So we should be able to make another request immediately
-        request_start_time = time.time()
+        request_start_time = time.monotonic()
         await limiter.acquire(endpoint, token)
-        request_elapsed = time.time() - request_start_time
+        request_elapsed = time.monotonic() - request_start_time
 
         # This request should execute immediately since the oldest request expired
         self.assertLess(request_elapsed, 0.01, 'Expected immediate execution due to sliding window')
@@ -238,14 +238,104 @@ class TestRateLimiter(unittest.IsolatedAsyncioTestCase):
         token = 'test_token'
 
         # Make exactly max_rps requests at the same time (or very close)
-        start_time = time.time()
+        start_time = time.monotonic()
         for _ in range(max_rps):
             await limiter.acquire(endpoint, token)
 
         # The next request should wait until the oldest request expires (1 second from when it was made)
         await limiter.acquire(endpoint, token)
-        elapsed = time.time() - start_time
+        elapsed = time.monotonic() - start_time
 
         # Should wait approximately 1 second
         self.assertGreaterEqual(elapsed, 0.9, 'Expected to wait at least 0.9 seconds')
         self.assertLessEqual(elapsed, 1.1, 'Expected to wait at most 1.1 seconds')
+
+    async def test_rate_limiter_try_acquire_nowait(self) -> None:
+        """Test that try_acquire_nowait takes free slots and refuses once the window is full"""
+        max_rps = 2
+        limiter = MethodRateLimiter(max_rps)
+        endpoint = '/test/endpoint'
+        token = 'test_token'
+
+        for _ in range(max_rps):
+            self.assertTrue(limiter.try_acquire_nowait(endpoint, token))
+
+        self.assertFalse(limiter.try_acquire_nowait(endpoint, token))
+        self.assertEqual(limiter.get_current_rps(endpoint, token), max_rps)
+
+    async def test_rate_limiter_try_acquire_nowait_does_not_overtake_waiters(self) -> None:
+        """Test that try_acquire_nowait refuses while another request is waiting in acquire"""
+        limiter = MethodRateLimiter(1)
+        endpoint = '/test/endpoint'
+        token = 'test_token'
+
+        await limiter.acquire(endpoint, token)
+        waiter = asyncio.ensure_future(limiter.acquire(endpoint, token))
+        await asyncio.sleep(0)
+
+        self.assertFalse(limiter.try_acquire_nowait(endpoint, token))
+        await waiter
+
+    async def test_rate_limiter_waiting_does_not_block_other_endpoints(self) -> None:
+        """Test that a request waiting for its window doesn't hold up requests to other endpoints"""
+        limiter = MethodRateLimiter(1)
+        token = 'test_token'
+
+        await limiter.acquire('/endpoint1', token)
+        waiter = asyncio.ensure_future(limiter.acquire('/endpoint1', token))
+        await asyncio.sleep(0)
+
+        start_time = time.monotonic()
+        await limiter.acquire('/endpoint2', token)
+        elapsed = time.monotonic() - start_time
+
+        self.assertLess(elapsed, 0.1, 'Expected immediate execution for another endpoint')
+        self.assertFalse(waiter.done())
+        await waiter
+
+    async def test_rate_limiter_forgets_idle_keys(self) -> None:
+        """Test that probing a key doesn't store it and idle keys are dropped"""
+        limiter = MethodRateLimiter(2)
+        token = 'test_token'
+
+        self.assertEqual(limiter.get_current_rps('/endpoint1', token), 0)
+        self.assertNotIn((token, '/endpoint1'), limiter.request_timestamps)
+
+        await limiter.acquire('/endpoint1', token)
+        limiter.clean_up_idle_keys(time.monotonic() + 1.0)
+
+        self.assertEqual(limiter.request_timestamps, {})
+        self.assertEqual(limiter._locks, {})
+
+    async def test_rate_limiter_try_acquire_nowait_does_not_overtake_lock_hand_off(self) -> None:
+        """Test that try_acquire_nowait refuses between a lock release and the next waiter resuming"""
+        limiter = MethodRateLimiter(2)
+        endpoint = '/test/endpoint'
+        token = 'test_token'
+
+        await limiter.acquire(endpoint, token)
+        lock = limiter._locks[(token, endpoint)]
+        await lock.acquire()
+        waiter = asyncio.ensure_future(limiter.acquire(endpoint, token))
+        await asyncio.sleep(0)
+
+        # The waiter is woken but hasn't resumed yet, so the lock already looks free
+        lock.release()
+        self.assertFalse(lock.locked())
+        self.assertFalse(limiter.try_acquire_nowait(endpoint, token))
+
+        await waiter
+        self.assertEqual(limiter.get_current_rps(endpoint, token), 2)
+
+    async def test_rate_limiter_try_acquire_nowait_forgets_idle_keys(self) -> None:
+        """Test that keys created only through try_acquire_nowait are swept once the interval passes"""
+        limiter = MethodRateLimiter(2, cleanup_interval=0.5)
+        endpoint = '/test/endpoint'
+
+        self.assertTrue(limiter.try_acquire_nowait(endpoint, 'token1'))
+        self.assertTrue(limiter.try_acquire_nowait(endpoint, 'token2'))
+        await asyncio.sleep(1.1)
+
+        self.assertTrue(limiter.try_acquire_nowait(endpoint, 'token3'))
+        self.assertEqual(list(limiter.request_timestamps), [('token3', endpoint)])
+        self.assertEqual(limiter._locks, {})
@@ -1,10 +1,14 @@
 import asyncio
 import logging
+import random
 from collections.abc import Awaitable, Callable
+from enum import Enum
 from functools import wraps
 from typing import Any, ParamSpec, TypeVar
 
-from .constants import ERROR_STATUSES_FOR_RETRY, MAX_RETRIES, RETRY_DELAY, SERVICE_NAME
+from dacite import Config
+
+from .constants import ERROR_STATUSES_FOR_RETRY, MAX_RETRIES, MAX_RETRY_DELAY, RETRY_DELAY, SERVICE_NAME
 from .exceptions import YangoRequestError
 
 P = ParamSpec('P')
@@ -12,6 +16,19 @@ R = TypeVar('R')
 
 logger = logging.getLogger(SERVICE_NAME)
 
+# Shared dacite configs: from_dict builds a new Config when none is passed, which drops the per-config caches
+# dacite keeps on the instance, so every decoder passes one of these instead
+DACITE_CONFIG = Config()
+DACITE_ENUM_CONFIG = Config(cast=[Enum])
+
+
+def get_retry_delay(retries: int) -> float:
+    """
+    Exponential backoff with full jitter.
+    Randomizing the whole delay keeps concurrent callers from retrying in lockstep after a shared failure
+    """
+    return random.uniform(0, min(MAX_RETRY_DELAY, RETRY_DELAY * 2 ** (retries - 1)))
+
 
 def retry_request(func: Callable[P, Awaitable[R]]) -> Callable[P, Awaitable[R]]:
     @wraps(func)
@@ -24,8 +41,8 @@ def retry_request(func: Callable[P, Awaitable[R]]) -> Callable[P, Awaitable[R]]:
             except YangoRequestError as e:
                 if e.status in ERROR_STATUSES_FOR_RETRY and retries <= MAX_RETRIES:
                     retries += 1
-                    logger.info(f'Request error {e.status} for {e.url}. {retries} attempt')
-                    await asyncio.sleep(RETRY_DELAY)
+                    logger.info('Request error %s for %s. %s attempt', e.status, e.url, retries)
+                    await asyncio.sleep(get_retry_delay(retries))
                     continue
 
                 raise e
@@ -33,6 +50,21 @@ def retry_request(func: Callable[P, Awaitable[R]]) -> Callable[P, Awaitable[R]]:
     return wrapper
 
 
+def install_uvloop() -> bool:
+    """
+    Use uvloop as the asyncio event loop if it is installed.
+    Must be called before the event loop is created, e.g. before `asyncio.run`.
+    Returns True if uvloop was installed
+    """
+    try:
+        import uvloop
+    except ImportError:
+        return False
+
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return True
+
+
 class YangoErrorHandler:
     async def process_yango_error(
         self,